@@ -0,0 +1,38 @@
+import calendar
+import datetime
+
+MAX_MONTHS = 12
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(month):
+    return (month + datetime.timedelta(days=32)).replace(day=1)
+
+
+def month_end(month):
+    return month.replace(day=calendar.monthrange(month.year, month.month)[1])
+
+
+def months_between(first_day, last_day):
+    month = month_start(first_day)
+    while month <= last_day:
+        yield month
+        month = next_month(month)
+
+
+def booked_days_mask(month, check_in, check_out):
+    """Bit n - 1 is set when day n of the month is taken (both ends included)"""
+    first = max(check_in, month)
+    last = min(check_out, month_end(month))
+    if first > last:
+        return 0
+    return ((1 << (last.day - first.day + 1)) - 1) << (first.day - 1)
+
+
+def days_to_string(month, booked_days):
+    return "".join(
+        "1" if booked_days >> day & 1 else "0" for day in range(month_end(month).day)
+    )
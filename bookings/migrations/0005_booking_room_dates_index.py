@@ -0,0 +1,17 @@
+# Generated by Django 4.1.3 on 2026-10-18 03:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['room', 'check_in', 'check_out'], name='bookings_room_dates_idx'),
+        ),
+    ]
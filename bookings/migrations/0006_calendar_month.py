@@ -0,0 +1,57 @@
+# Generated by Django 4.1.3 on 2026-10-18 03:20
+
+from django.db import migrations, models
+from django.utils import timezone
+from bookings.calendars import booked_days_mask, months_between
+import django.db.models.deletion
+
+
+def backfill_calendar(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    CalendarMonth = apps.get_model("bookings", "CalendarMonth")
+    this_month = timezone.localtime(timezone.now()).date().replace(day=1)
+    booked = {}
+    stays = Booking.objects.filter(
+        room__isnull=False,
+        check_in__isnull=False,
+        check_out__gte=this_month,
+    ).values_list("room_id", "check_in", "check_out")
+    for room_id, check_in, check_out in stays.iterator():
+        for month in months_between(check_in, check_out):
+            booked[room_id, month] = booked.get(
+                (room_id, month), 0
+            ) | booked_days_mask(month, check_in, check_out)
+    CalendarMonth.objects.bulk_create(
+        [
+            CalendarMonth(room_id=room_id, month=month, booked_days=booked_days)
+            for (room_id, month), booked_days in booked.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0005_room_search_indexes'),
+        ('bookings', '0005_booking_room_dates_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('month', models.DateField()),
+                ('booked_days', models.PositiveIntegerField(default=0)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calendar_months', to='rooms.room')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='calendarmonth',
+            constraint=models.UniqueConstraint(fields=('room', 'month'), name='bookings_calendar_room_month'),
+        ),
+        migrations.RunPython(backfill_calendar, migrations.RunPython.noop),
+    ]
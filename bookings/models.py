@@ -1,7 +1,17 @@
-from django.db import models
+from django.db import models, transaction
 from common.models import AbstractTimeStamp
 
 
+class BookingQuerySet(models.QuerySet):
+    """Booking QuerySet Definition"""
+
+    def overlapping(self, check_in, check_out):
+        return self.filter(
+            check_in__lte=check_out,
+            check_out__gte=check_in,
+        )
+
+
 class Booking(AbstractTimeStamp):
     """Booking Model Definition"""
 
@@ -46,5 +56,43 @@ class Booking(AbstractTimeStamp):
     )
     guests = models.PositiveIntegerField()
 
+    objects = BookingQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["room", "check_in", "check_out"],
+                name="bookings_room_dates_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.booking_type.title()} booking for: {self.user}"
+
+    def save(self, *args, **kwargs):
+        # bookings.signals updates the room calendar
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class CalendarMonth(AbstractTimeStamp):
+    """Booked days of a room for one month, kept in step by bookings.signals"""
+
+    room = models.ForeignKey(
+        "rooms.Room",
+        on_delete=models.CASCADE,
+        related_name="calendar_months",
+    )
+    month = models.DateField()
+    booked_days = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["room", "month"],
+                name="bookings_calendar_room_month",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.room} / {self.month:%Y-%m}"
@@ -33,10 +33,11 @@ class CreateRoomBookingSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "Check in should be smaller than check out."
             )
-        if Booking.objects.filter(
-            check_in__lte=data["check_out"],
-            check_out__gte=data["check_in"],
-        ).exists():
+        if (
+            Booking.objects.filter(room=self.context["room"])
+            .overlapping(data["check_in"], data["check_out"])
+            .exists()
+        ):
             raise serializers.ValidationError(
                 "Those (or some) of those dates are already taken."
             )
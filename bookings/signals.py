@@ -0,0 +1,73 @@
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Booking, CalendarMonth
+from .calendars import booked_days_mask, month_end, months_between
+
+
+def stay_of(booking):
+    if booking.room_id and booking.check_in and booking.check_out:
+        to_date = Booking._meta.get_field("check_in").to_python
+        return (booking.room_id, to_date(booking.check_in), to_date(booking.check_out))
+    return None
+
+
+def mark_booked(room_id, check_in, check_out):
+    for month in months_between(check_in, check_out):
+        calendar_month, _ = CalendarMonth.objects.get_or_create(
+            room_id=room_id,
+            month=month,
+        )
+        CalendarMonth.objects.filter(pk=calendar_month.pk).update(
+            booked_days=F("booked_days").bitor(
+                booked_days_mask(month, check_in, check_out)
+            ),
+        )
+
+
+def rebuild_months(room_id, check_in, check_out):
+    """Recompute the months a stay touched from the bookings left in them"""
+    for month in months_between(check_in, check_out):
+        booked_days = 0
+        stays = (
+            Booking.objects.filter(room_id=room_id)
+            .overlapping(month, month_end(month))
+            .values_list("check_in", "check_out")
+        )
+        for stay_check_in, stay_check_out in stays:
+            booked_days |= booked_days_mask(month, stay_check_in, stay_check_out)
+        CalendarMonth.objects.update_or_create(
+            room_id=room_id,
+            month=month,
+            defaults={"booked_days": booked_days},
+        )
+
+
+@receiver(pre_save, sender=Booking)
+def remember_previous_stay(sender, instance, **kwargs):
+    instance._previous_stay = None
+    if instance.pk:
+        instance._previous_stay = (
+            Booking.objects.filter(pk=instance.pk)
+            .values_list("room_id", "check_in", "check_out")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Booking)
+def book_calendar_days(sender, instance, **kwargs):
+    current = stay_of(instance)
+    previous = instance._previous_stay
+    if previous == current:
+        return
+    if previous and all(previous):
+        rebuild_months(*previous)
+    if current:
+        mark_booked(*current)
+
+
+@receiver(post_delete, sender=Booking)
+def free_calendar_days(sender, instance, **kwargs):
+    stay = stay_of(instance)
+    if stay:
+        rebuild_months(*stay)
@@ -2,15 +2,18 @@ from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework import exceptions
 from rest_framework.response import Response
+from common.cache import catalogue_response
 from .models import Category
 from .serializers import CategorySerializer
 
 
 class Categories(APIView):
     def get(self, request):
-        all_categories = Category.objects.all()
-        serializer = CategorySerializer(all_categories, many=True)
-        return Response(serializer.data)
+        return catalogue_response(
+            request,
+            Category,
+            lambda: CategorySerializer(Category.objects.all(), many=True).data,
+        )
 
     def post(self, request):
         serializer = CategorySerializer(data=request.data)
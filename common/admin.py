@@ -1,3 +1,73 @@
 from django.contrib import admin
 
-# Register your models here.
+
+def hidden_params(changelist, names):
+    """The other filters, searches and ordering, to resubmit with a filter form"""
+    return [
+        (name, value) for name, value in changelist.params.items() if name not in names
+    ]
+
+
+class InputFilter(admin.SimpleListFilter):
+    """A text box instead of one link per value, for columns too big to list
+
+    Subclasses set title and parameter_name and filter in queryset().
+    """
+
+    template = "admin/common/input_filter.html"
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        yield {
+            "name": self.parameter_name,
+            "value": self.value() or "",
+            "hidden": hidden_params(changelist, [self.parameter_name]),
+            "reset_query_string": changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+        }
+
+
+class RangeFilter(admin.FieldListFilter):
+    """Min / max boxes for a numeric field, instead of a SELECT DISTINCT of it"""
+
+    template = "admin/common/range_filter.html"
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg_gte = f"{field_path}__gte"
+        self.lookup_kwarg_lte = f"{field_path}__lte"
+        super().__init__(field, request, params, model, model_admin, field_path)
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg_gte, self.lookup_kwarg_lte]
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        # an empty box is submitted as "", which means no bound
+        self.used_parameters = {
+            name: value for name, value in self.used_parameters.items() if value
+        }
+        return super().queryset(request, queryset)
+
+    def choices(self, changelist):
+        yield {
+            "gte": (
+                self.lookup_kwarg_gte,
+                self.used_parameters.get(self.lookup_kwarg_gte, ""),
+            ),
+            "lte": (
+                self.lookup_kwarg_lte,
+                self.used_parameters.get(self.lookup_kwarg_lte, ""),
+            ),
+            "hidden": hidden_params(changelist, self.expected_parameters()),
+            "reset_query_string": changelist.get_query_string(
+                remove=self.expected_parameters()
+            ),
+        }
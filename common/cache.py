@@ -0,0 +1,51 @@
+import hashlib
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+CATALOGUE_TIMEOUT = 60 * 60 * 24
+
+
+def get_version(model):
+    """Changes whenever a row is saved, added or deleted
+
+    Read from the database rather than a counter in the cache: with a
+    per-process cache (LocMemCache) a counter bumped in one worker never
+    reaches the others. Catalogue tables are small, so this is one cheap
+    aggregate.
+    """
+    stamp = model.objects.aggregate(
+        changed_at=Max("updated_at"),
+        count=Count("pk"),
+    )
+    changed_at = stamp["changed_at"]
+    return f"{changed_at.timestamp() if changed_at else 0}-{stamp['count']}"
+
+
+def make_etag(*parts):
+    return f'"{hashlib.md5(repr(parts).encode()).hexdigest()}"'
+
+
+def is_not_modified(request, etag):
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return "*" in etags or etag in etags
+
+
+def catalogue_response(request, model, serialize):
+    """Serve serialize() from the cache, keyed and ETagged by the model version"""
+    version = get_version(model)
+    etag = f'"{model._meta.label_lower}-{version}"'
+    if is_not_modified(request, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    key = f"catalogue:{model._meta.label_lower}:{version}"
+    data = cache.get(key)
+    if data is None:
+        data = list(serialize())
+        cache.set(key, data, timeout=CATALOGUE_TIMEOUT)
+    return Response(data, headers={"ETag": etag})
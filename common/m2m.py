@@ -0,0 +1,85 @@
+from django.core.exceptions import ValidationError
+from django.db.models.signals import m2m_changed
+
+
+def check_pks(model, pks):
+    """Normalize pks, raising model.DoesNotExist unless every one exists"""
+    try:
+        pks = {model._meta.pk.to_python(pk) for pk in pks}
+    except (TypeError, ValidationError):
+        raise model.DoesNotExist
+    found = set(model.objects.filter(pk__in=pks).values_list("pk", flat=True))
+    if len(found) != len(pks):
+        raise model.DoesNotExist(f"{model.__name__} {pks - found} not found.")
+    return pks
+
+
+def through_fields(model, field_name):
+    """(through model, owner column, target column) of a ManyToManyField"""
+    field = model._meta.get_field(field_name)
+    through = field.remote_field.through
+    source = through._meta.get_field(field.m2m_field_name()).attname
+    target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+    return through, source, target
+
+
+def add_m2m(model, pk, field_name, pks):
+    """Link pks to <model pk>.<field_name> with one INSERT, keeping existing links
+
+    Sends no m2m_changed; sync_m2m does.
+    """
+    through, source, target = through_fields(model, field_name)
+    through.objects.bulk_create(
+        [through(**{source: pk, target: target_pk}) for target_pk in pks],
+        ignore_conflicts=True,
+    )
+
+
+def remove_m2m(model, pk, field_name, pks):
+    """Unlink pks from <model pk>.<field_name> with one DELETE
+
+    Sends no m2m_changed; sync_m2m does.
+    """
+    through, source, target = through_fields(model, field_name)
+    removed, _ = through.objects.filter(**{source: pk, f"{target}__in": pks}).delete()
+    return removed
+
+
+def sync_m2m(instance, field_name, pks):
+    """Make instance.<field_name> link exactly the given pks.
+
+    Writes go straight to the through table: one bulk delete for the links
+    that went away and one bulk insert for the new ones, each between the
+    pre_/post_ m2m_changed signals that related manager would send. Returns
+    True when anything changed.
+    """
+    model = type(instance)
+    field = model._meta.get_field(field_name)
+    through, source, target = through_fields(model, field_name)
+
+    wanted = check_pks(field.related_model, pks)
+    links = through.objects.filter(**{source: instance.pk})
+    current = set(links.values_list(target, flat=True))
+
+    def changed(action, pk_set):
+        m2m_changed.send(
+            sender=through,
+            instance=instance,
+            action=action,
+            reverse=False,
+            model=field.related_model,
+            pk_set=pk_set,
+            using=links.db,
+        )
+
+    removed = current - wanted
+    if removed:
+        changed("pre_remove", removed)
+        remove_m2m(model, instance.pk, field_name, removed)
+        changed("post_remove", removed)
+    added = wanted - current
+    if added:
+        changed("pre_add", added)
+        add_m2m(model, instance.pk, field_name, added)
+        changed("post_add", added)
+    return bool(removed or added)
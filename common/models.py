@@ -1,8 +1,28 @@
 from django.db import models
+from django.db.models import Q
 
+STARS = (1, 2, 3, 4, 5)
+
+
+def star_of(rating):
+    """The histogram bucket of a rating, clamped to 1-5 stars"""
+    return min(max(rating, STARS[0]), STARS[-1])
+
+
+def star_count_field(star):
+    return f"rating_{star}_count"
 
-class AbstractTimeStamp(models.Model):
 
+def star_filter(star):
+    """Q matching the reviews counted in a star bucket, see star_of"""
+    if star == STARS[0]:
+        return Q(rating__lte=star)
+    if star == STARS[-1]:
+        return Q(rating__gte=star)
+    return Q(rating=star)
+
+
+class AbstractTimeStamp(models.Model):
     """Abstract TimeStamp"""
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -10,3 +30,49 @@ class AbstractTimeStamp(models.Model):
 
     class Meta:
         abstract = True
+
+
+class AbstractReviewStats(models.Model):
+    """Abstract Review Stats, kept in step by reviews.signals"""
+
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    rating_1_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    rating_2_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    rating_3_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    rating_4_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    rating_5_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+
+    class Meta:
+        abstract = True
+
+    def review_rating(self):
+        if self.review_count == 0:
+            return 0
+        return round(self.rating_sum / self.review_count, 2)
+
+    review_rating.short_description = "Rating"
+
+    def rating_histogram(self):
+        return {star: getattr(self, star_count_field(star)) for star in STARS}
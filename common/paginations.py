@@ -0,0 +1,128 @@
+import base64
+import json
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def encode_cursor(obj, field="created_at", reverse=False):
+    position = [getattr(obj, field).isoformat(), obj.pk]
+    if reverse:
+        position.append(True)
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """(datetime, pk, reverse) of a cursor, ValueError if it isn't one"""
+    try:
+        value, pk, *reverse = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value = parse_datetime(value)
+    except (TypeError, ValueError):
+        value = None
+    if not value or type(pk) is not int or reverse not in ([], [True]):
+        raise ValueError("Invalid cursor.")
+    return value, pk, bool(reverse)
+
+
+def keyset(field, value, pk, reverse=False):
+    """Rows after (value, pk) in (-field, -pk) order, or before it if reverse"""
+    op = "gt" if reverse else "lt"
+    return Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"pk__{op}": pk})
+
+
+def after_cursor(queryset, cursor, field="created_at"):
+    """Rows after cursor, for a queryset ordered by (-field, -pk)"""
+    value, pk, _ = decode_cursor(cursor)
+    return queryset.filter(keyset(field, value, pk))
+
+
+class CreatedAtCursorPagination(BasePagination):
+
+    """Keyset pagination on (created_at, pk), newest first
+
+    The cursor holds both values of the edge row, so every page is one
+    indexed range scan and rows written between requests never shift a
+    page: there is no OFFSET.
+    """
+
+    field = "created_at"
+    cursor_query_param = "cursor"
+    page_size = settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size < 1:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        reverse = False
+        if cursor:
+            try:
+                value, pk, reverse = decode_cursor(cursor)
+            except ValueError as error:
+                raise NotFound(str(error))
+            queryset = queryset.filter(keyset(self.field, value, pk, reverse))
+        if reverse:
+            queryset = queryset.order_by(self.field, "pk")
+        else:
+            queryset = queryset.order_by(f"-{self.field}", "-pk")
+
+        page = list(queryset[: page_size + 1])
+        has_more = len(page) > page_size
+        page = page[:page_size]
+        if reverse:
+            page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, bool(cursor)
+        self.page = page
+        return page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            encode_cursor(self.page[-1], self.field),
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        url = self.request.build_absolute_uri()
+        if not self.page:
+            return remove_query_param(url, self.cursor_query_param)
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            encode_cursor(self.page[0], self.field, reverse=True),
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+
+class LastMessageCursorPagination(CreatedAtCursorPagination):
+    """Inbox order: most recently active conversation first"""
+
+    field = "last_message_at"
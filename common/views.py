@@ -1,3 +1,48 @@
-from django.shortcuts import render
+import asyncio
+from asgiref.sync import sync_to_async
+from django.utils.functional import classproperty
+from rest_framework.views import APIView
 
-# Create your views here.
+
+class AsyncAPIView(APIView):
+
+    """APIView whose handlers may be coroutines
+
+    Authentication, permissions and throttling stay DRF's sync code and
+    run in one worker thread; `async def` handlers are awaited on the event
+    loop, plain handlers (writes) keep running in a thread. Async handlers
+    must not touch lazy relations: fetch everything the serializer reads up
+    front with the async ORM or `sync_to_async`.
+    """
+
+    @classproperty
+    def view_is_async(cls):
+        return True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -1,10 +1,79 @@
-from multiprocessing import AuthenticationError
+import copy
+import datetime
 import jwt
 from django.conf import settings
-from rest_framework.authentication import BaseAuthentication
+from django.utils import timezone
+from rest_framework.authentication import BaseAuthentication, TokenAuthentication
 from rest_framework.exceptions import AuthenticationFailed
+from common.lru import TTLLRUCache
 from users.models import User
 
+ACCESS_TOKEN_LIFETIME = getattr(
+    settings, "JWT_ACCESS_TOKEN_LIFETIME", datetime.timedelta(minutes=15)
+)
+REFRESH_TOKEN_LIFETIME = getattr(
+    settings, "JWT_REFRESH_TOKEN_LIFETIME", datetime.timedelta(days=14)
+)
+
+# pk -> User, so a valid access token usually costs no users query.
+# Each process has its own copy: a token_version bump made elsewhere is
+# seen here after at most JWT_USER_CACHE_TTL seconds. Requests get a copy
+# of the cached User, never the shared instance.
+jwt_user_cache = TTLLRUCache(
+    maxsize=getattr(settings, "JWT_USER_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "JWT_USER_CACHE_TTL", 60),
+)
+
+# token key -> (User, Token) for CachingTokenAuthentication
+token_user_cache = TTLLRUCache(
+    maxsize=getattr(settings, "TOKEN_USER_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "TOKEN_USER_CACHE_TTL", 300),
+)
+
+
+def issue_token(user, token_type):
+    lifetime = (
+        ACCESS_TOKEN_LIFETIME if token_type == "access" else REFRESH_TOKEN_LIFETIME
+    )
+    now = timezone.now()
+    return jwt.encode(
+        {
+            "type": token_type,
+            "pk": user.pk,
+            "username": user.username,
+            "is_host": user.is_host,
+            "ver": user.token_version,
+            "iat": now,
+            "exp": now + lifetime,
+        },
+        settings.SECRET_KEY,
+        algorithm="HS256",
+    )
+
+
+def issue_tokens(user):
+    return {
+        "token": issue_token(user, "access"),
+        "refresh": issue_token(user, "refresh"),
+    }
+
+
+def decode_token(token, token_type):
+    try:
+        decoded = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=["HS256"],
+            options={"require": ["exp", "pk", "ver"]},
+        )
+    except jwt.ExpiredSignatureError:
+        raise AuthenticationFailed("Token Expired")
+    except jwt.InvalidTokenError:
+        raise AuthenticationFailed("Invalid Token")
+    if decoded.get("type") != token_type:
+        raise AuthenticationFailed("Invalid Token")
+    return decoded
+
 
 class TrustMeBroAuthentication(BaseAuthentication):
     def authenticate(self, request):
@@ -23,16 +92,36 @@ class JWTAuthentication(BaseAuthentication):
         token = request.headers.get("jwt")
         if not token:
             return None
-        decoded = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=["HS256"],
-        )
-        pk = decoded.get("pk")
-        if not pk:
-            raise AuthenticationFailed("Invalid Token")
-        try:
-            user = User.objects.get(pk=pk)
-            return (user, None)
-        except User.DoesNotExist:
-            raise AuthenticationFailed("User Not Found")
+        return (self.authenticate_token(token), None)
+
+    def authenticate_token(self, token):
+        """The active user an access token belongs to, or AuthenticationFailed"""
+        decoded = decode_token(token, "access")
+        pk = decoded["pk"]
+        user = jwt_user_cache.get(pk)
+        if user is None or user.token_version != decoded["ver"]:
+            try:
+                user = User.objects.get(pk=pk)
+            except User.DoesNotExist:
+                raise AuthenticationFailed("User Not Found")
+            jwt_user_cache.set(pk, user)
+        if user.token_version != decoded["ver"] or not user.is_active:
+            raise AuthenticationFailed("Token Revoked")
+        return copy.copy(user)
+
+
+class CachingTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that remembers recently seen tokens.
+
+    Use it in place of rest_framework.authentication.TokenAuthentication in
+    REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"]. users.signals evicts a
+    token when it is deleted or its user is saved (e.g. deactivated).
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_user_cache.get(key)
+        if cached is None:
+            cached = super().authenticate_credentials(key)
+            token_user_cache.set(key, cached)
+        user, token = cached
+        return (copy.copy(user), token)
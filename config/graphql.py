@@ -0,0 +1,232 @@
+import hashlib
+import json
+import strawberry
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousOperation
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLList,
+    OperationDefinitionNode,
+    OperationType,
+    get_named_type,
+    get_nullable_type,
+    value_from_ast,
+)
+from graphql.execution import ExecutionResult
+from strawberry.django.context import StrawberryDjangoContext
+from strawberry.django.views import AsyncGraphQLView, GraphQLView
+from strawberry.extensions import Extension
+from strawberry.http import GraphQLRequestData, process_result
+
+MAX_DEPTH = getattr(settings, "GRAPHQL_MAX_DEPTH", 8)
+MAX_COST = getattr(settings, "GRAPHQL_MAX_COST", 2000)
+# parsed/validated documents kept per process, keyed by query text
+DOCUMENT_CACHE_SIZE = getattr(settings, "GRAPHQL_DOCUMENT_CACHE_SIZE", 256)
+PERSISTED_QUERY_TIMEOUT = getattr(
+    settings, "GRAPHQL_PERSISTED_QUERY_TIMEOUT", 60 * 60 * 24 * 7
+)
+
+
+class QueryCostLimiter(Extension):
+
+    """Rejects operations whose estimated cost exceeds MAX_COST
+
+    Every selected field costs 1. A list multiplies the cost of what it
+    selects by its size: the `first` argument of the enclosing field when
+    there is one, PAGE_SIZE otherwise. Runs after validation so variables
+    are known, and before any resolver is called.
+    """
+
+    def on_executing_start(self):
+        context = self.execution_context
+        operation = next(
+            (
+                definition
+                for definition in context.graphql_document.definitions
+                if isinstance(definition, OperationDefinitionNode)
+                and (
+                    context.operation_name is None
+                    or definition.name
+                    and definition.name.value == context.operation_name
+                )
+            ),
+            None,
+        )
+        if operation is None:
+            return
+        schema = context.schema._schema
+        root = {
+            OperationType.QUERY: schema.query_type,
+            OperationType.MUTATION: schema.mutation_type,
+        }.get(operation.operation)
+        if root is None:
+            return
+        self.fragment_definitions = {
+            definition.name.value: definition
+            for definition in context.graphql_document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
+        cost = self.selection_cost(operation.selection_set, root, None)
+        if cost > MAX_COST:
+            context.result = ExecutionResult(
+                data=None,
+                errors=[
+                    GraphQLError(
+                        f"Query cost {cost} exceeds the maximum of {MAX_COST}.",
+                        nodes=[operation],
+                    )
+                ],
+            )
+
+    def selection_cost(self, selection_set, parent_type, size):
+        cost = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                cost += self.field_cost(selection, parent_type, size)
+                continue
+            if isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragment_definitions.get(selection.name.value)
+                if fragment is None:
+                    continue
+                selection = fragment
+            cost += self.selection_cost(selection.selection_set, parent_type, size)
+        return cost
+
+    def field_cost(self, node, parent_type, size):
+        field = getattr(parent_type, "fields", {}).get(node.name.value)
+        if field is None or node.selection_set is None:
+            return 1
+        if "first" in field.args:
+            size = self.argument_value(node, field, "first")
+        field_type = get_nullable_type(field.type)
+        multiplier = 1
+        if isinstance(field_type, GraphQLList):
+            multiplier = size or settings.PAGE_SIZE
+            size = None
+        children = self.selection_cost(
+            node.selection_set, get_named_type(field_type), size
+        )
+        return 1 + multiplier * children
+
+    def argument_value(self, node, field, name):
+        argument = field.args[name]
+        for argument_node in node.arguments:
+            if argument_node.name.value == name:
+                value = value_from_ast(
+                    argument_node.value,
+                    argument.type,
+                    self.execution_context.variables,
+                )
+                break
+        else:
+            value = argument.default_value
+        return value if isinstance(value, int) else None
+
+
+class PersistedQueryNotFound(Exception):
+    pass
+
+
+class PersistedQueryMixin:
+
+    """Accepts automatic persisted queries
+
+    A client may send `extensions.persistedQuery.sha256Hash` instead of
+    the query text. Unknown hashes answer PersistedQueryNotFound, and the
+    client retries once with both the hash and the query, which is then
+    stored under the hash for every later request.
+    """
+
+    def get_request_data(self, request):
+        try:
+            data = self.parse_body(request)
+        except json.decoder.JSONDecodeError:
+            raise SuspiciousOperation("Unable to parse request body as JSON")
+        extensions = data.get("extensions") or {}
+        if isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except json.decoder.JSONDecodeError:
+                raise SuspiciousOperation("Unable to parse extensions as JSON")
+        persisted = extensions.get("persistedQuery")
+        if not persisted:
+            return super().get_request_data(request)
+
+        sha256_hash = persisted.get("sha256Hash")
+        if persisted.get("version") != 1 or not isinstance(sha256_hash, str):
+            raise SuspiciousOperation("Unsupported persisted query")
+        key = f"graphql:persisted:{sha256_hash}"
+        query = data.get("query")
+        if query:
+            if hashlib.sha256(query.encode()).hexdigest() != sha256_hash:
+                raise SuspiciousOperation("Persisted query hash does not match")
+            cache.set(key, query, PERSISTED_QUERY_TIMEOUT)
+        else:
+            query = cache.get(key)
+            if query is None:
+                raise PersistedQueryNotFound()
+        return GraphQLRequestData(
+            query=query,
+            variables=data.get("variables"),
+            operation_name=data.get("operationName"),
+        )
+
+    def persisted_query_not_found(self):
+        return JsonResponse(
+            {
+                "errors": [
+                    {
+                        "message": "PersistedQueryNotFound",
+                        "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+                    }
+                ]
+            }
+        )
+
+
+class PersistedQueryGraphQLView(PersistedQueryMixin, GraphQLView):
+    @method_decorator(csrf_exempt)
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except PersistedQueryNotFound:
+            return self.persisted_query_not_found()
+
+
+class AsyncPersistedQueryGraphQLView(PersistedQueryMixin, AsyncGraphQLView):
+    async def get_root_value(self, request):
+        return None
+
+    async def get_context(self, request, response):
+        return StrawberryDjangoContext(request=request, response=response)
+
+    async def process_result(self, request, result):
+        return process_result(result)
+
+    @method_decorator(csrf_exempt)
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except PersistedQueryNotFound:
+            return self.persisted_query_not_found()
+
+
+class Schema(strawberry.Schema):
+
+    """Schema whose async execution runs the resolvers in a worker thread
+
+    Resolvers and the room loaders use the sync ORM, so under
+    AsyncGraphQLView the whole operation runs in a single thread hop
+    rather than one per field, and the event loop stays free meanwhile.
+    """
+
+    async def execute(self, query, **kwargs):
+        return await sync_to_async(self.execute_sync)(query, **kwargs)
@@ -1,5 +1,7 @@
 import strawberry
+from strawberry.extensions import ParserCache, QueryDepthLimiter, ValidationCache
 from rooms import schema as rooms_schema
+from .graphql import DOCUMENT_CACHE_SIZE, MAX_DEPTH, QueryCostLimiter, Schema
 
 
 @strawberry.type
@@ -12,7 +14,13 @@ class Mutation(rooms_schema.Mutation):
     pass
 
 
-schema = strawberry.Schema(
+schema = Schema(
     query=Query,
     mutation=Mutation,
+    extensions=[
+        QueryDepthLimiter(max_depth=MAX_DEPTH),
+        ParserCache(maxsize=DOCUMENT_CACHE_SIZE),
+        ValidationCache(maxsize=DOCUMENT_CACHE_SIZE),
+        QueryCostLimiter,
+    ],
 )
@@ -1,11 +1,24 @@
 from django.contrib import admin
-from .models import ChattingRoom, Message
+from .models import ChattingRoom, Message, Participant
+
+
+class ParticipantInline(admin.TabularInline):
+    """Participant Inline Definition"""
+
+    model = Participant
+    readonly_fields = (
+        "unread_count",
+        "last_message_at",
+    )
+    extra = 0
 
 
 @admin.register(ChattingRoom)
 class ChattingRoomAdmin(admin.ModelAdmin):
     """ChattingRoom Admin Definition"""
 
+    inlines = (ParticipantInline,)
+
     list_display = (
         "__str__",
         "created_at",
@@ -5,3 +5,6 @@ class DirectMessagesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "direct_messages"
     verbose_name = "Direct Messages"
+
+    def ready(self):
+        from . import signals
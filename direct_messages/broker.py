@@ -0,0 +1,141 @@
+import asyncio
+import json
+import threading
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+except ImportError:  # only needed with DIRECT_MESSAGES_BROKER = "redis"
+    redis = aioredis = None
+
+# messages buffered per connection before it counts as a slow consumer
+QUEUE_SIZE = getattr(settings, "DIRECT_MESSAGES_QUEUE_SIZE", 100)
+
+
+class Subscription:
+    """One WebSocket connection's bounded queue
+
+    Owned by the event loop of the connection. A consumer that falls
+    QUEUE_SIZE messages behind is marked overflowed and gets disconnected
+    instead of buffering without bound; the client resyncs from the
+    thread endpoint when it reconnects.
+    """
+
+    def __init__(self, user_pk, queue_size):
+        self.user_pk = user_pk
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = asyncio.Event()
+
+    def offer(self, payload):
+        if self.overflowed.is_set():
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.overflowed.set()
+
+
+class LocalBroker:
+    """In-process fan-out from user pks to their open connections"""
+
+    def __init__(self, queue_size=QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscriptions = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, user_pk):
+        """Call from the connection's event loop"""
+        subscription = Subscription(user_pk, self.queue_size)
+        with self.lock:
+            self.subscriptions.setdefault(user_pk, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.user_pk, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(subscription.user_pk, None)
+
+    def publish(self, user_pks, payload):
+        """Thread safe, never blocks on a consumer"""
+        self.deliver(user_pks, json.dumps(payload))
+
+    def deliver(self, user_pks, text):
+        with self.lock:
+            targets = [
+                subscription
+                for user_pk in user_pks
+                for subscription in self.subscriptions.get(user_pk, ())
+            ]
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, text)
+            except RuntimeError:  # its event loop is gone
+                self.unsubscribe(subscription)
+
+    def connection_count(self):
+        with self.lock:
+            return sum(
+                len(subscriptions) for subscriptions in self.subscriptions.values()
+            )
+
+
+class RedisBroker(LocalBroker):
+    """LocalBroker fed through Redis pub/sub, for more than one process
+
+    publish() goes to Redis; every process listens on the channel and
+    delivers to its own connections.
+    """
+
+    channel = "direct_messages"
+
+    def __init__(self, url, queue_size=QUEUE_SIZE):
+        if redis is None:
+            raise ImproperlyConfigured("The redis broker needs the redis package.")
+        super().__init__(queue_size)
+        self.client = redis.Redis.from_url(url)
+        self.url = url
+        self.listener = None
+
+    def subscribe(self, user_pk):
+        if self.listener is None or self.listener.done():
+            self.listener = asyncio.get_running_loop().create_task(self.listen())
+        return super().subscribe(user_pk)
+
+    def publish(self, user_pks, payload):
+        self.client.publish(
+            self.channel,
+            json.dumps({"users": list(user_pks), "payload": payload}),
+        )
+
+    async def listen(self):
+        client = aioredis.Redis.from_url(self.url)
+        async with client.pubsub() as pubsub:
+            await pubsub.subscribe(self.channel)
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                data = json.loads(message["data"])
+                self.deliver(data["users"], json.dumps(data["payload"]))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            kind = getattr(settings, "DIRECT_MESSAGES_BROKER", "local")
+            if kind == "redis":
+                _broker = RedisBroker(settings.DIRECT_MESSAGES_REDIS_URL)
+            elif kind == "local":
+                _broker = LocalBroker()
+            else:
+                raise ImproperlyConfigured(f"Unknown DIRECT_MESSAGES_BROKER {kind}")
+        return _broker
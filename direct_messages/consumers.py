@@ -0,0 +1,76 @@
+import asyncio
+from urllib.parse import parse_qs
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import AuthenticationFailed
+from config.authentication import JWTAuthentication
+from .broker import get_broker
+
+# close codes: https://www.iana.org/assignments/websocket/websocket.xhtml
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+def authenticate(scope):
+    """User of the ?token=<jwt access token> of the handshake, or None"""
+    token = parse_qs(scope["query_string"].decode()).get("token")
+    if not token:
+        return None
+    try:
+        return JWTAuthentication().authenticate_token(token[0])
+    except AuthenticationFailed:
+        return None
+
+
+async def direct_messages_socket(scope, receive, send):
+    """Pushes every new message of the user's chatting rooms, see signals"""
+
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+    user = await sync_to_async(authenticate)(scope)
+    if user is None:
+        await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+        return
+
+    broker = get_broker()
+    subscription = broker.subscribe(user.pk)
+    try:
+        await send({"type": "websocket.accept"})
+
+        async def read():
+            # clients only listen; wait for them to hang up
+            while (await receive())["type"] != "websocket.disconnect":
+                pass
+
+        async def write():
+            while True:
+                text = await subscription.queue.get()
+                await send({"type": "websocket.send", "text": text})
+
+        tasks = [
+            asyncio.create_task(read()),
+            asyncio.create_task(write()),
+            asyncio.create_task(subscription.overflowed.wait()),
+        ]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()
+        if subscription.overflowed.is_set():
+            try:
+                await asyncio.wait_for(
+                    send({"type": "websocket.close", "code": CLOSE_TRY_AGAIN_LATER}),
+                    timeout=1,
+                )
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def websocket_router(scope, receive, send):
+    if scope["path"].rstrip("/") == "/ws/direct-messages":
+        return await direct_messages_socket(scope, receive, send)
+    await receive()
+    await send({"type": "websocket.close"})
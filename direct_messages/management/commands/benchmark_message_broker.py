@@ -0,0 +1,129 @@
+import asyncio
+import time
+import tracemalloc
+from django.core.management.base import BaseCommand, CommandError
+from config.authentication import issue_token
+from direct_messages.broker import get_broker
+from direct_messages.consumers import direct_messages_socket
+from users.models import User
+
+
+class FakeConnection:
+    """Drives direct_messages_socket like an ASGI server would"""
+
+    def __init__(self, token, slow=False):
+        self.scope = {
+            "type": "websocket",
+            "path": "/ws/direct-messages/",
+            "query_string": f"token={token}".encode(),
+        }
+        self.slow = slow
+        self.received = 0
+        self.close_code = None
+        self.connected = False
+        self.hang_up = asyncio.Event()
+
+    async def receive(self):
+        if not self.connected:
+            self.connected = True
+            return {"type": "websocket.connect"}
+        await self.hang_up.wait()
+        return {"type": "websocket.disconnect", "code": 1000}
+
+    async def send(self, message):
+        if message["type"] == "websocket.send":
+            if self.slow:
+                # a client that stopped reading: the socket never drains
+                await asyncio.Event().wait()
+            self.received += 1
+        elif message["type"] == "websocket.close":
+            self.close_code = message.get("code")
+
+    async def run(self):
+        await direct_messages_socket(self.scope, self.receive, self.send)
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Measure in-process WebSocket fan-out: messages/sec through the "
+        "broker and memory per open connection."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--connections", type=int, default=1000)
+        parser.add_argument(
+            "--slow",
+            type=int,
+            default=0,
+            help="How many of the connections never read.",
+        )
+        parser.add_argument("--messages", type=int, default=1000)
+        parser.add_argument(
+            "--burst",
+            type=int,
+            default=50,
+            help="Messages published before waiting for delivery.",
+        )
+        parser.add_argument("--users", type=int, default=10)
+
+    def handle(self, *args, **options):
+        users = list(User.objects.filter(is_active=True)[: options["users"]])
+        if not users:
+            raise CommandError("Create a user first.")
+        if options["slow"] > options["connections"]:
+            raise CommandError("--slow can't exceed --connections.")
+        tokens = [issue_token(user, "access") for user in users]
+        asyncio.run(self.benchmark([user.pk for user in users], tokens, options))
+
+    async def benchmark(self, user_pks, tokens, options):
+        broker = get_broker()
+        total = options["connections"]
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+
+        connections = [
+            FakeConnection(tokens[i % len(tokens)], slow=i < options["slow"])
+            for i in range(total)
+        ]
+        tasks = [asyncio.create_task(connection.run()) for connection in connections]
+        while broker.connection_count() < total:
+            await asyncio.sleep(0.01)
+        per_connection = (tracemalloc.get_traced_memory()[0] - before) / total
+        tracemalloc.stop()
+        self.stdout.write(
+            f"{total} connections open, {per_connection / 1024:.1f} KiB each"
+        )
+
+        fast = [connection for connection in connections if not connection.slow]
+        messages = options["messages"]
+        payload = {"room": 0, "message": {"text": "x" * 100}}
+
+        def publish():
+            # as a request thread would, through Message post_save
+            for sent in range(1, messages + 1):
+                broker.publish(user_pks, payload)
+                if sent % options["burst"] == 0 or sent == messages:
+                    while any(connection.received < sent for connection in fast):
+                        time.sleep(0.001)
+
+        started = time.perf_counter()
+        await asyncio.get_running_loop().run_in_executor(None, publish)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{messages / elapsed:10.1f} messages/s published, "
+            f"{messages * len(fast) / elapsed:10.1f} deliveries/s "
+            f"to {len(fast)} readers"
+        )
+
+        dropped = sum(
+            1 for connection in connections if connection.slow and connection.close_code
+        )
+        self.stdout.write(
+            f"{dropped}/{options['slow']} slow connections dropped at "
+            f"{broker.queue_size} queued messages"
+        )
+        for connection in connections:
+            connection.hang_up.set()
+        await asyncio.gather(*tasks)
+        self.stdout.write(f"{broker.connection_count()} connections left open")
@@ -0,0 +1,132 @@
+# Generated by Django 4.1.3 on 2026-10-18 03:35
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def backfill_inbox(apps, schema_editor):
+    ChattingRoom = apps.get_model("direct_messages", "ChattingRoom")
+    Participant = apps.get_model("direct_messages", "Participant")
+    Message = apps.get_model("direct_messages", "Message")
+    ChattingRoom.objects.update(
+        last_message=Subquery(
+            Message.objects.filter(room=OuterRef("pk"))
+            .order_by("-created_at", "-pk")
+            .values("pk")[:1]
+        )
+    )
+    Participant.objects.update(
+        last_message_at=Coalesce(
+            Subquery(
+                Message.objects.filter(room=OuterRef("room"))
+                .order_by("-created_at", "-pk")
+                .values("created_at")[:1]
+            ),
+            Subquery(
+                ChattingRoom.objects.filter(pk=OuterRef("room")).values("created_at")
+            ),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("direct_messages", "0002_initial"),
+    ]
+
+    operations = [
+        # ChattingRoom.users already has this table as its automatic through
+        # table, so Participant only takes it over in the migration state
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="Participant",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "room",
+                            models.ForeignKey(
+                                db_column="chattingroom_id",
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="participants",
+                                to="direct_messages.chattingroom",
+                            ),
+                        ),
+                        (
+                            "user",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="participations",
+                                to=settings.AUTH_USER_MODEL,
+                            ),
+                        ),
+                    ],
+                    options={
+                        "db_table": "direct_messages_chattingroom_users",
+                        "unique_together": {("room", "user")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="chattingroom",
+                    name="users",
+                    field=models.ManyToManyField(
+                        related_name="chattingrooms",
+                        through="direct_messages.Participant",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            database_operations=[],
+        ),
+        migrations.AddField(
+            model_name="participant",
+            name="unread_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="participant",
+            name="last_message_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.AddField(
+            model_name="chattingroom",
+            name="last_message",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="direct_messages.message",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["room", "created_at"], name="direct_messages_thread_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="participant",
+            index=models.Index(
+                fields=["user", "last_message_at"], name="direct_messages_inbox_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_inbox, migrations.RunPython.noop),
+    ]
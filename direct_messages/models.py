@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from common.models import AbstractTimeStamp
 
 
@@ -7,13 +8,61 @@ class ChattingRoom(AbstractTimeStamp):
 
     users = models.ManyToManyField(
         "users.User",
+        through="direct_messages.Participant",
         related_name="chattingrooms",
     )
+    # kept by direct_messages.signals, so the inbox needs no subquery
+    last_message = models.ForeignKey(
+        "direct_messages.Message",
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
 
     def __str__(self):
         return "Chatting Room"
 
 
+class Participant(models.Model):
+    """Participant Model Definition, one user's side of a chatting room"""
+
+    room = models.ForeignKey(
+        "direct_messages.ChattingRoom",
+        db_column="chattingroom_id",
+        on_delete=models.CASCADE,
+        related_name="participants",
+    )
+    user = models.ForeignKey(
+        "users.User",
+        on_delete=models.CASCADE,
+        related_name="participations",
+    )
+    unread_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    last_message_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+    )
+
+    class Meta:
+        # the table used to be the automatic through table of users
+        db_table = "direct_messages_chattingroom_users"
+        unique_together = ("room", "user")
+        indexes = [
+            models.Index(
+                fields=["user", "last_message_at"],
+                name="direct_messages_inbox_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user} in {self.room}"
+
+
 class Message(AbstractTimeStamp):
     """Message Model Definition"""
 
@@ -31,5 +80,18 @@ class Message(AbstractTimeStamp):
         related_name="messages",
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["room", "created_at"],
+                name="direct_messages_thread_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user} says: {self.text}"
+
+    def save(self, *args, **kwargs):
+        # direct_messages.signals updates the inbox of every participant
+        with transaction.atomic():
+            super().save(*args, **kwargs)
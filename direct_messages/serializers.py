@@ -0,0 +1,39 @@
+from rest_framework.serializers import ModelSerializer, PrimaryKeyRelatedField
+from users.serializers import TinyUserSerializer
+from .models import Message, Participant
+
+
+class MessageSerializer(ModelSerializer):
+    user = TinyUserSerializer(read_only=True)
+
+    class Meta:
+        model = Message
+        fields = (
+            "pk",
+            "user",
+            "text",
+            "created_at",
+        )
+
+
+class InboxSerializer(ModelSerializer):
+    room = PrimaryKeyRelatedField(read_only=True)
+    users = TinyUserSerializer(
+        source="room.users",
+        read_only=True,
+        many=True,
+    )
+    last_message = MessageSerializer(
+        source="room.last_message",
+        read_only=True,
+    )
+
+    class Meta:
+        model = Participant
+        fields = (
+            "room",
+            "users",
+            "last_message",
+            "last_message_at",
+            "unread_count",
+        )
@@ -0,0 +1,42 @@
+from django.db import transaction
+from django.db.models import Case, F, When
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .broker import get_broker
+from .models import ChattingRoom, Message, Participant
+from .serializers import MessageSerializer
+
+
+@receiver(post_save, sender=Message)
+def update_inbox(sender, instance, created, **kwargs):
+    """Move the room to the top of every inbox, counting it unread but for the sender"""
+    if not created:
+        return
+    ChattingRoom.objects.filter(pk=instance.room_id).update(
+        last_message=instance,
+        updated_at=instance.created_at,
+    )
+    Participant.objects.filter(room_id=instance.room_id).update(
+        last_message_at=instance.created_at,
+        unread_count=Case(
+            When(user_id=instance.user_id, then=F("unread_count")),
+            default=F("unread_count") + 1,
+        ),
+    )
+
+
+@receiver(post_save, sender=Message)
+def push_message(sender, instance, created, **kwargs):
+    """Deliver the message to the open WebSockets of every participant"""
+    if not created:
+        return
+    user_pks = list(
+        Participant.objects.filter(room_id=instance.room_id).values_list(
+            "user_id", flat=True
+        )
+    )
+    payload = {
+        "room": instance.room_id,
+        "message": MessageSerializer(instance).data,
+    }
+    transaction.on_commit(lambda: get_broker().publish(user_pks, payload))
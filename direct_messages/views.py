@@ -1,3 +1,105 @@
-from django.shortcuts import render
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework import exceptions
+from rest_framework import status
+from rest_framework.response import Response
+from .models import ChattingRoom, Message, Participant
+from .serializers import InboxSerializer, MessageSerializer
+from common.m2m import check_pks
+from common.paginations import CreatedAtCursorPagination, LastMessageCursorPagination
+from common.views import AsyncAPIView
+from users.models import User
 
-# Create your views here.
+
+def inbox_of(user):
+    """Everything InboxSerializer reads: one join plus one users query per page"""
+    return (
+        Participant.objects.filter(user=user)
+        .select_related("room__last_message__user")
+        .prefetch_related("room__users")
+    )
+
+
+class Inbox(AsyncAPIView):
+
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request):
+        paginator = LastMessageCursorPagination()
+        page = await sync_to_async(paginator.paginate_queryset)(
+            inbox_of(request.user),
+            request,
+            view=self,
+        )
+        serializer = InboxSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def post(self, request):
+        user_pks = request.data.get("users")
+        if type(user_pks) is not list:
+            raise exceptions.ParseError("Users should be a list.")
+        try:
+            user_pks = check_pks(User, user_pks)
+        except User.DoesNotExist:
+            raise exceptions.ParseError("User not found.")
+        user_pks.add(request.user.pk)
+        if len(user_pks) < 2:
+            raise exceptions.ParseError("Invite at least one other user.")
+
+        with transaction.atomic():
+            room = ChattingRoom.objects.create()
+            Participant.objects.bulk_create(
+                [Participant(room=room, user_id=pk) for pk in user_pks]
+            )
+        serializer = InboxSerializer(inbox_of(request.user).get(room=room))
+        return Response(serializer.data)
+
+
+class ChattingRoomMessages(AsyncAPIView):
+
+    permission_classes = [IsAuthenticated]
+
+    def check_participant(self, pk, user):
+        if not Participant.objects.filter(room_id=pk, user=user).exists():
+            raise exceptions.NotFound
+
+    async def get(self, request, pk):
+        await sync_to_async(self.check_participant)(pk, request.user)
+        paginator = CreatedAtCursorPagination()
+        page = await sync_to_async(paginator.paginate_queryset)(
+            Message.objects.filter(room_id=pk).select_related("user"),
+            request,
+            view=self,
+        )
+        serializer = MessageSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def post(self, request, pk):
+        self.check_participant(pk, request.user)
+        serializer = MessageSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors)
+
+        # direct_messages.signals updates every participant's inbox
+        message = serializer.save(
+            room_id=pk,
+            user=request.user,
+        )
+        serializer = MessageSerializer(message)
+        return Response(serializer.data)
+
+
+class ChattingRoomRead(APIView):
+
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, pk):
+        read = Participant.objects.filter(
+            room_id=pk,
+            user=request.user,
+        ).update(unread_count=0)
+        if not read:
+            raise exceptions.NotFound
+        return Response(status=status.HTTP_200_OK)
@@ -1,8 +1,8 @@
 from django.db import models
-from common.models import AbstractTimeStamp
+from common.models import AbstractTimeStamp, AbstractReviewStats
 
 
-class Experience(AbstractTimeStamp):
+class Experience(AbstractTimeStamp, AbstractReviewStats):
     """Experience Model Definition"""
 
     name = models.CharField(max_length=250)
@@ -2,15 +2,18 @@ from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework import exceptions
 from rest_framework.response import Response
+from common.cache import catalogue_response
 from .models import Perk
 from .serializers import PerkSerializer
 
 
 class Perks(APIView):
     def get(self, request):
-        all_perks = Perk.objects.all()
-        serializer = PerkSerializer(all_perks, many=True)
-        return Response(serializer.data)
+        return catalogue_response(
+            request,
+            Perk,
+            lambda: PerkSerializer(Perk.objects.all(), many=True).data,
+        )
 
     def post(self, request):
         serializer = PerkSerializer(data=request.data)
@@ -1,26 +1,37 @@
 from django.contrib import admin
+from common.admin import InputFilter
+from common.models import STARS, star_filter
 from .models import Review
 
 
-class WordFilter(admin.SimpleListFilter):
+class WordFilter(InputFilter):
 
     title = "Filter by words!"
 
     parameter_name = "word"
 
-    def lookups(self, request, model_admin):
-        return [
-            ("good", "Good"),
-            ("great", "Great"),
-            ("awesome", "Awesome"),
-        ]
-
     def queryset(self, request, reviews):
         word = self.value()
         if word:
+            # served by the payload trigram index on PostgreSQL
             return reviews.filter(payload__contains=word)
-        else:
-            reviews
+        return reviews
+
+
+class StarFilter(admin.SimpleListFilter):
+
+    title = "Rating"
+
+    parameter_name = "stars"
+
+    def lookups(self, request, model_admin):
+        return [(star, f"{star}⭐️") for star in STARS]
+
+    def queryset(self, request, reviews):
+        star = self.value()
+        if star and star.isdigit():
+            return reviews.filter(star_filter(int(star)))
+        return reviews
 
 
 class GoodBadFilter(admin.SimpleListFilter):
@@ -53,10 +64,11 @@ class ReviewAdmin(admin.ModelAdmin):
         "__str__",
         "payload",
     )
+    list_select_related = ("user",)
     list_filter = (
         WordFilter,
         GoodBadFilter,
-        "rating",
+        StarFilter,
         "user__is_host",
         "room__category",
         "room__pet_friendly",
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from common.models import STARS, star_count_field, star_filter
+from rooms.models import Room
+from experiences.models import Experience
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Recompute the stored review count, rating sum and star histogram "
+        "of rooms and experiences."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows updated per statement.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        for model, field in ((Room, "room"), (Experience, "experience")):
+            reviews = (
+                Review.objects.filter(**{field: OuterRef("pk")})
+                .order_by()
+                .values(field)
+            )
+            review_count = reviews.annotate(count=Count("pk")).values("count")
+            rating_sum = reviews.annotate(total=Sum("rating")).values("total")
+            star_counts = {
+                star_count_field(star): Coalesce(
+                    Subquery(
+                        reviews.annotate(
+                            count=Count("pk", filter=star_filter(star))
+                        ).values("count")
+                    ),
+                    0,
+                )
+                for star in STARS
+            }
+
+            last_pk = model.objects.aggregate(last=Max("pk"))["last"] or 0
+            updated = 0
+            for start in range(0, last_pk, batch_size):
+                updated += model.objects.filter(
+                    pk__gt=start,
+                    pk__lte=start + batch_size,
+                ).update(
+                    review_count=Coalesce(Subquery(review_count), 0),
+                    rating_sum=Coalesce(Subquery(rating_sum), 0),
+                    **star_counts,
+                )
+            self.stdout.write(
+                f"{model._meta.verbose_name_plural}: {updated} recomputed."
+            )
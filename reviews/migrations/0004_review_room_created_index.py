@@ -0,0 +1,17 @@
+# Generated by Django 4.1.3 on 2026-10-18 03:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['room', 'created_at'], name='reviews_room_created_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+def create_payload_index(apps, schema_editor):
+    # a trigram GIN index serves payload__contains (LIKE '%word%') on
+    # PostgreSQL; other databases keep scanning
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS reviews_payload_trgm_idx "
+        "ON reviews_review USING gin (payload gin_trgm_ops)"
+    )
+
+
+def drop_payload_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS reviews_payload_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("reviews", "0004_review_room_created_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_payload_index, drop_payload_index),
+    ]
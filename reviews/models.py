@@ -1,7 +1,20 @@
-from django.db import models
+from django.db import models, transaction
 from common.models import AbstractTimeStamp
 
 
+class ReviewQuerySet(models.QuerySet):
+    def for_list(self):
+        """Reviews with only what ReviewSerializer reads, author joined"""
+        return self.select_related("user").only(
+            "payload",
+            "rating",
+            "created_at",
+            "user__name",
+            "user__avatar",
+            "user__username",
+        )
+
+
 class Review(AbstractTimeStamp):
     """Review Model Definition"""
 
@@ -28,5 +41,20 @@ class Review(AbstractTimeStamp):
     payload = models.TextField()
     rating = models.PositiveIntegerField()
 
+    objects = ReviewQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["room", "created_at"],
+                name="reviews_room_created_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"{self.user} / {self.rating}⭐️"
+
+    def save(self, *args, **kwargs):
+        # reviews.signals updates the rating counters on room / experience
+        with transaction.atomic():
+            super().save(*args, **kwargs)
@@ -0,0 +1,64 @@
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from rooms.models import Room
+from experiences.models import Experience
+from common.models import star_count_field, star_of
+from .models import Review
+
+
+def add_to_stats(room_id, experience_id, rating, count):
+    """Add (count=1) or take back (count=-1) one rating"""
+    star_field = star_count_field(star_of(rating))
+    for model, pk in ((Room, room_id), (Experience, experience_id)):
+        if pk:
+            model.objects.filter(pk=pk).update(
+                review_count=F("review_count") + count,
+                rating_sum=F("rating_sum") + rating * count,
+                **{star_field: F(star_field) + count},
+            )
+
+
+def locked_stats(pk):
+    """The stored (room_id, experience_id, rating), locked until commit
+
+    Review.save and delete() run in a transaction, so a concurrent edit of
+    the same review waits here instead of reading the same old rating.
+    """
+    return (
+        Review.objects.select_for_update()
+        .filter(pk=pk)
+        .values_list("room_id", "experience_id", "rating")
+        .first()
+    )
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_rating(sender, instance, **kwargs):
+    instance._previous_stats = None
+    if instance.pk:
+        instance._previous_stats = locked_stats(instance.pk)
+
+
+@receiver(post_save, sender=Review)
+def count_saved_review(sender, instance, **kwargs):
+    current = (instance.room_id, instance.experience_id, instance.rating)
+    previous = instance._previous_stats
+    if previous == current:
+        return
+    if previous:
+        room_id, experience_id, rating = previous
+        add_to_stats(room_id, experience_id, rating, -1)
+    add_to_stats(instance.room_id, instance.experience_id, instance.rating, 1)
+
+
+@receiver(pre_delete, sender=Review)
+def remember_deleted_rating(sender, instance, **kwargs):
+    instance._previous_stats = locked_stats(instance.pk)
+
+
+@receiver(post_delete, sender=Review)
+def uncount_deleted_review(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_stats", None)
+    if previous:
+        add_to_stats(*previous, -1)
@@ -1,6 +1,7 @@
 import strawberry
 from strawberry import auto
 from . import models
+from users.types import UserType
 
 
 @strawberry.django.type(models.Review)
@@ -8,3 +9,4 @@ class ReviewType:
     id: auto
     payload: auto
     rating: auto
+    user: UserType
@@ -1,12 +1,160 @@
-from django.contrib import admin
-from .models import Room, Amenity, Facility, HouseRule
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME, ActionForm
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.urls import reverse
+from django.utils.html import format_html
+from categories.models import Category
+from common.admin import InputFilter, RangeFilter
+from .models import (
+    RANGE_FILTER_FIELDS,
+    Room,
+    RoomBulkUpdate,
+    Amenity,
+    Facility,
+    HouseRule,
+)
+
+# selections larger than this are queued for process_room_updates
+BULK_UPDATE_THRESHOLD = getattr(settings, "ROOMS_BULK_UPDATE_THRESHOLD", 10000)
+
+Action = RoomBulkUpdate.ActionChoices
+
+
+class RoomActionForm(ActionForm):
+    """Parameters of the bulk room actions, next to the action select"""
+
+    price = forms.IntegerField(required=False, min_value=0)
+    percent = forms.IntegerField(required=False, min_value=-100, max_value=1000)
+    category = forms.ModelChoiceField(
+        queryset=Category.objects.filter(
+            category_type=Category.CatogoryTypeChoices.ROOM
+        ),
+        required=False,
+    )
+
+
+def action_params(model_admin, request, *names):
+    form = model_admin.action_form(request.POST)
+    form.fields["action"].choices = model_admin.get_action_choices(request)
+    if not form.is_valid():
+        model_admin.message_user(
+            request,
+            " ".join(error for errors in form.errors.values() for error in errors),
+            messages.ERROR,
+        )
+        return None
+    params = {name: form.cleaned_data[name] for name in names}
+    missing = [name for name, value in params.items() if value is None]
+    if missing:
+        model_admin.message_user(
+            request,
+            f"Fill in {', '.join(missing)} to run this action.",
+            messages.ERROR,
+        )
+        return None
+    return params
+
+
+def bulk_update(model_admin, request, rooms, action, value=None, category=None):
+    update = RoomBulkUpdate(
+        action=action,
+        value=value,
+        category=category,
+        created_by=request.user,
+    )
+    if rooms.count() <= BULK_UPDATE_THRESHOLD:
+        updated = update.apply(rooms)
+        model_admin.message_user(request, f"{updated} rooms updated.")
+        return
+    if request.POST.get("select_across") == "1":
+        # every room the changelist filters match, rooms created later aside
+        update.params = request.GET.urlencode()
+        update.max_pk = Room.objects.aggregate(max_pk=Max("pk"))["max_pk"] or 0
+    else:
+        update.pks = [int(pk) for pk in request.POST.getlist(ACTION_CHECKBOX_NAME)]
+    # counted the way the worker will select them
+    update.total = update.selected_rooms().count()
+    update.save()
+    model_admin.message_user(
+        request,
+        format_html(
+            '{} rooms queued, follow the progress in <a href="{}">{}</a>.',
+            update.total,
+            reverse("admin:rooms_roombulkupdate_change", args=[update.pk]),
+            update,
+        ),
+    )
+
+
+class CityFilter(InputFilter):
+
+    title = "City"
+
+    parameter_name = "city"
+
+    def queryset(self, request, rooms):
+        city = self.value()
+        if city:
+            return rooms.in_city(city)
+        return rooms
+
+
+class HostFilter(InputFilter):
+
+    title = "Host username"
+
+    parameter_name = "host"
+
+    def queryset(self, request, rooms):
+        username = self.value()
+        if username:
+            return rooms.hosted_by(username)
+        return rooms
 
 
 @admin.action(description="Set all prices to zero")
 def reset_prices(model_admin, request, rooms):
-    for room in rooms.all():
-        room.price = 0
-        room.save()
+    bulk_update(model_admin, request, rooms, Action.SET_PRICE, value=0)
+
+
+@admin.action(description="Set price")
+def set_price(model_admin, request, rooms):
+    params = action_params(model_admin, request, "price")
+    if params:
+        bulk_update(model_admin, request, rooms, Action.SET_PRICE, params["price"])
+
+
+@admin.action(description="Change price by percent")
+def change_price(model_admin, request, rooms):
+    params = action_params(model_admin, request, "percent")
+    if params:
+        bulk_update(model_admin, request, rooms, Action.CHANGE_PRICE, params["percent"])
+
+
+@admin.action(description="Toggle instant book")
+def toggle_instant_book(model_admin, request, rooms):
+    bulk_update(model_admin, request, rooms, Action.TOGGLE_INSTANT_BOOK)
+
+
+@admin.action(description="Toggle pet friendly")
+def toggle_pet_friendly(model_admin, request, rooms):
+    bulk_update(model_admin, request, rooms, Action.TOGGLE_PET_FRIENDLY)
+
+
+@admin.action(description="Reassign category")
+def set_category(model_admin, request, rooms):
+    params = action_params(model_admin, request, "category")
+    if params:
+        bulk_update(
+            model_admin,
+            request,
+            rooms,
+            Action.SET_CATEGORY,
+            category=params["category"],
+        )
 
 
 @admin.register(Room)
@@ -79,7 +227,16 @@ class RoomAdmin(admin.ModelAdmin):
         ),
     )
 
-    actions = (reset_prices,)
+    action_form = RoomActionForm
+
+    actions = (
+        reset_prices,
+        set_price,
+        change_price,
+        toggle_instant_book,
+        toggle_pet_friendly,
+        set_category,
+    )
 
     list_display = (
         "name",
@@ -107,17 +264,13 @@ class RoomAdmin(admin.ModelAdmin):
         "bathrooms",
     )
 
+    # nothing here may list the distinct values of a column: the sidebar is
+    # drawn on every changelist load
     list_filter = (
-        "city",
-        "price",
-        "guests",
-        "beds",
-        "bedrooms",
-        "bathrooms",
-        "check_in",
-        "check_out",
+        CityFilter,
+        *((field, RangeFilter) for field in RANGE_FILTER_FIELDS),
         "instant_book",
-        "host",
+        HostFilter,
     )
 
     search_fields = (
@@ -133,6 +286,36 @@ class RoomAdmin(admin.ModelAdmin):
         "house_rules",
     )
 
+    list_select_related = ("host",)
+
+    # skip the second COUNT(*) over the unfiltered table on every page
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # a correlated subquery rather than Count("amenities") keeps GROUP BY
+        # out of the paginator's COUNT(*)
+        amenity_count = (
+            Room.amenities.through.objects.filter(room=OuterRef("pk"))
+            .order_by()
+            .values("room")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(amenity_count=Coalesce(Subquery(amenity_count), 0))
+        )
+
+    # queued bulk updates rebuild a selection with Room.objects.matching(),
+    # so filters and search go through the same RoomQuerySet methods
+    def get_search_results(self, request, queryset, search_term):
+        return queryset.search(search_term), False
+
+    @admin.display(description="Total Amenities", ordering="amenity_count")
+    def total_amenities(self, room):
+        return room.amenity_count
+
     def count_amenities(self, obj):
         return obj.amenities.count()
 
@@ -148,6 +331,51 @@ class RoomAdmin(admin.ModelAdmin):
         return obj.house_rules.count()
 
 
+@admin.register(RoomBulkUpdate)
+class RoomBulkUpdateAdmin(admin.ModelAdmin):
+    """RoomBulkUpdate Admin Definition"""
+
+    list_display = (
+        "__str__",
+        "status",
+        "progress",
+        "created_by",
+        "created_at",
+        "updated_at",
+    )
+
+    list_filter = ("status",)
+
+    list_select_related = ("created_by",)
+
+    readonly_fields = (
+        "action",
+        "value",
+        "category",
+        "status",
+        "progress",
+        "error",
+        "created_by",
+        "created_at",
+        "updated_at",
+    )
+
+    fields = readonly_fields
+
+    @admin.display(description="Progress")
+    def progress(self, update):
+        if not update.total:
+            return "-"
+        percent = update.processed * 100 // update.total
+        return f"{update.processed} / {update.total} ({percent}%)"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Amenity, Facility, HouseRule)
 class ItemAdmin(admin.ModelAdmin):
 
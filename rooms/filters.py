@@ -0,0 +1,119 @@
+import datetime
+from django.db.models import Count, Exists, OuterRef
+from django.utils.dateparse import parse_date
+from rest_framework import exceptions
+from bookings.models import Booking
+from .models import Room
+
+# query parameter -> Room lookup, for the integer filters of the room search
+INTEGER_FILTERS = {
+    "min_price": "price__gte",
+    "max_price": "price__lte",
+    "guests": "guests__gte",
+    "beds": "beds__gte",
+    "bedrooms": "bedrooms__gte",
+    "bathrooms": "bathrooms__gte",
+    "category": "category_id",
+}
+
+CHOICE_FILTERS = {
+    "type_of_place": Room.TypeOfPlaceChoices,
+    "property_type": Room.PropertyTypeChoices,
+}
+
+BOOLEAN_FILTERS = ("instant_book", "pet_friendly")
+
+
+def parse_int(name, value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise exceptions.ParseError(f"'{name}' should be a number.")
+
+
+def parse_bool(name, value):
+    if isinstance(value, bool):
+        return value
+    if value in ("true", "1"):
+        return True
+    if value in ("false", "0"):
+        return False
+    raise exceptions.ParseError(f"'{name}' should be true or false.")
+
+
+def parse_day(name, value):
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if not day:
+        raise exceptions.ParseError(f"'{name}' should be a date (YYYY-MM-DD).")
+    return day
+
+
+def parse_pks(name, value):
+    if isinstance(value, str):
+        value = [pk for pk in value.split(",") if pk]
+    return {parse_int(name, pk) for pk in value}
+
+
+def filter_rooms(rooms, params):
+    """Narrow a Room queryset down with the room search parameters"""
+
+    for name, lookup in INTEGER_FILTERS.items():
+        value = params.get(name)
+        if value is not None and value != "":
+            rooms = rooms.filter(**{lookup: parse_int(name, value)})
+
+    for name, choices in CHOICE_FILTERS.items():
+        value = params.get(name)
+        if value:
+            if value not in choices.values:
+                raise exceptions.ParseError(f"'{value}' is not a valid {name}.")
+            rooms = rooms.filter(**{name: value})
+
+    for name in BOOLEAN_FILTERS:
+        value = params.get(name)
+        if value is not None and value != "":
+            rooms = rooms.filter(**{name: parse_bool(name, value)})
+
+    city = params.get("city")
+    if city:
+        # Room.save() stores cities capitalized
+        rooms = rooms.filter(city=str.capitalize(city))
+    country = params.get("country")
+    if country:
+        rooms = rooms.filter(country=country)
+
+    amenities = params.get("amenities")
+    if amenities:
+        amenity_pks = parse_pks("amenities", amenities)
+        with_all_amenities = (
+            Room.amenities.through.objects.filter(amenity_id__in=amenity_pks)
+            .values("room_id")
+            .annotate(matched=Count("amenity_id"))
+            .filter(matched=len(amenity_pks))
+            .values("room_id")
+        )
+        rooms = rooms.filter(pk__in=with_all_amenities)
+
+    check_in = params.get("check_in")
+    check_out = params.get("check_out")
+    if check_in or check_out:
+        if not (check_in and check_out):
+            raise exceptions.ParseError("Both check_in and check_out are required.")
+        check_in = parse_day("check_in", check_in)
+        check_out = parse_day("check_out", check_out)
+        if check_out <= check_in:
+            raise exceptions.ParseError("Check in should be smaller than check out.")
+        rooms = rooms.filter(
+            ~Exists(
+                Booking.objects.overlapping(check_in, check_out).filter(
+                    room=OuterRef("pk"),
+                )
+            )
+        )
+
+    return rooms
@@ -0,0 +1,102 @@
+from django.conf import settings
+from django.db.models import F, Prefetch, Window, prefetch_related_objects
+from django.db.models.functions import RowNumber
+from reviews.models import Review
+from users.models import User
+from .models import Room
+
+
+class BatchLoader:
+    """Request scoped loader: the first miss loads every key queued so far"""
+
+    def __init__(self, batch_load, default=None):
+        self.batch_load = batch_load
+        self.default = default
+        self.cache = {}
+        self.queue = set()
+
+    def prime(self, keys):
+        self.queue.update(key for key in keys if key not in self.cache)
+
+    def load(self, key):
+        if key not in self.cache:
+            keys, self.queue = self.queue | {key}, set()
+            loaded = self.batch_load(keys)
+            for queued_key in keys:
+                self.cache[queued_key] = loaded.get(queued_key, self.default)
+        return self.cache[key]
+
+
+class RoomLoaders:
+    """Batches the per-room lookups of RoomType across one GraphQL request"""
+
+    def __init__(self, user):
+        self.user = user
+        self.room_pks = set()
+        self.hosts = BatchLoader(User.objects.in_bulk)
+        self.is_liked = BatchLoader(self.load_is_liked, default=False)
+        self.review_pages = {}
+
+    def prime(self, rooms):
+        self.hosts.prime(room.host_id for room in rooms)
+        self.is_liked.prime(room.pk for room in rooms)
+        self.room_pks.update(room.pk for room in rooms)
+
+    def reviews(self, room_pk, page):
+        if page not in self.review_pages:
+            loader = BatchLoader(
+                lambda room_pks: self.load_reviews(room_pks, page),
+                default=[],
+            )
+            loader.prime(self.room_pks)
+            self.review_pages[page] = loader
+        return self.review_pages[page].load(room_pk)
+
+    def load_is_liked(self, room_pks):
+        if not self.user.is_authenticated:
+            return {}
+        liked = Room.wishlists.through.objects.filter(
+            wishlist__user=self.user,
+            room_id__in=room_pks,
+        ).values_list("room_id", flat=True)
+        return {room_pk: True for room_pk in liked}
+
+    def load_reviews(self, room_pks, page):
+        """One page of reviews for every room, numbered per room in SQL"""
+        page_size = settings.PAGE_SIZE
+        start = (max(page, 1) - 1) * page_size
+        ranked = (
+            Review.objects.filter(room_id__in=room_pks)
+            .only("room_id", "user_id", "payload", "rating", "created_at")
+            .annotate(
+                position=Window(
+                    RowNumber(),
+                    partition_by=[F("room_id")],
+                    order_by=[F("created_at").desc(), F("pk").desc()],
+                )
+            )
+        )
+        sql, params = ranked.query.sql_with_params()
+        reviews = Review.objects.raw(
+            f"SELECT * FROM ({sql}) ranked "
+            "WHERE position > %s AND position <= %s "
+            "ORDER BY room_id, position",
+            (*params, start, start + page_size),
+        )
+        reviews = list(reviews)
+        # every author of the page in one query
+        prefetch_related_objects(
+            reviews,
+            Prefetch("user", queryset=User.objects.only("username", "email", "name")),
+        )
+        by_room = {}
+        for review in reviews:
+            by_room.setdefault(review.room_id, []).append(review)
+        return by_room
+
+
+def get_loaders(info):
+    request = info.context.request
+    if not hasattr(request, "room_loaders"):
+        request.room_loaders = RoomLoaders(request.user)
+    return request.room_loaders
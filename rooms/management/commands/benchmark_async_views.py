@@ -0,0 +1,170 @@
+import asyncio
+import io
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from config.authentication import issue_token
+from rooms.models import Room
+from users.models import User
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Compare read endpoint throughput through the ASGI and the WSGI "
+        "handler at a given concurrency, in process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            help="Paths to request. Defaults to the room read endpoints.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Requests per path and handler.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=50,
+            help="Requests in flight at once.",
+        )
+        parser.add_argument(
+            "--user",
+            help="Username to authenticate as, with a JWT.",
+        )
+        parser.add_argument(
+            "--host",
+            default="localhost",
+            help="Host header, must be in ALLOWED_HOSTS.",
+        )
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or self.default_paths()
+        headers = {"host": options["host"]}
+        if options["user"]:
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError("User not found.")
+            headers["jwt"] = issue_token(user, "access")
+
+        self.stdout.write(
+            f"{options['requests']} requests per path, "
+            f"concurrency {options['concurrency']}"
+        )
+        for path in paths:
+            for name, run in (("asgi", self.run_asgi), ("wsgi", self.run_wsgi)):
+                started = time.perf_counter()
+                timings, statuses = run(
+                    path, headers, options["requests"], options["concurrency"]
+                )
+                elapsed = time.perf_counter() - started
+                p95 = statistics.quantiles(timings, n=20)[-1]
+                self.stdout.write(
+                    f"{name} {len(timings) / elapsed:8.1f} req/s  "
+                    f"p50 {statistics.median(timings):8.2f}ms  "
+                    f"p95 {p95:8.2f}ms  {sorted(set(statuses))}  {path}"
+                )
+
+    def default_paths(self):
+        room = Room.objects.order_by("-review_count").first()
+        if room is None:
+            raise CommandError("Create a room first.")
+        return [
+            "/api/v1/rooms/",
+            f"/api/v1/rooms/{room.pk}",
+            f"/api/v1/rooms/{room.pk}/reviews",
+            f"/api/v1/rooms/{room.pk}/bookings",
+        ]
+
+    def run_asgi(self, path, headers, total, concurrency):
+        return asyncio.run(self.asgi_requests(path, headers, total, concurrency))
+
+    async def asgi_requests(self, path, headers, total, concurrency):
+        application = ASGIHandler()
+        semaphore = asyncio.Semaphore(concurrency)
+        path, _, query_string = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "query_string": query_string.encode(),
+            "headers": [
+                (name.encode(), value.encode()) for name, value in headers.items()
+            ],
+            "server": (headers["host"], 80),
+            "client": ("127.0.0.1", 0),
+        }
+
+        async def request():
+            messages = [{"type": "http.request", "body": b"", "more_body": False}]
+            disconnected = asyncio.Event()
+            statuses = []
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+
+            async with semaphore:
+                started = time.perf_counter()
+                await application(dict(scope), receive, send)
+                disconnected.set()
+                return (time.perf_counter() - started) * 1000, statuses[0]
+
+        results = await asyncio.gather(*(request() for _ in range(total)))
+        return [timing for timing, _ in results], [status for _, status in results]
+
+    def run_wsgi(self, path, headers, total, concurrency):
+        application = WSGIHandler()
+        path, _, query_string = path.partition("?")
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": query_string,
+            "SCRIPT_NAME": "",
+            "SERVER_NAME": headers["host"],
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "wsgi.url_scheme": "http",
+            "wsgi.errors": io.StringIO(),
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in headers.items():
+            environ[f"HTTP_{name.upper().replace('-', '_')}"] = value
+
+        def request():
+            statuses = []
+
+            def start_response(status, response_headers, exc_info=None):
+                statuses.append(int(status.split()[0]))
+
+            started = time.perf_counter()
+            response = application(
+                dict(environ, **{"wsgi.input": io.BytesIO()}), start_response
+            )
+            b"".join(response)
+            response.close()
+            return (time.perf_counter() - started) * 1000, statuses[0]
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(lambda _: request(), range(total)))
+        return [timing for timing, _ in results], [status for _, status in results]
@@ -0,0 +1,115 @@
+import random
+import statistics
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rooms.models import Room, Amenity
+from rooms.filters import filter_rooms
+from users.models import User
+
+CITIES = (
+    ("South Korea", "Seoul"),
+    ("South Korea", "Busan"),
+    ("United States of America", "Los angeles"),
+    ("United States of America", "New york"),
+    ("France", "Paris"),
+    ("Japan", "Tokyo"),
+)
+
+SCENARIOS = (
+    {"city": "seoul"},
+    {"city": "seoul", "min_price": "100", "max_price": "200"},
+    {"country": "South Korea", "city": "busan", "guests": "4"},
+    {"property_type": "apartment", "type_of_place": "entire_place", "max_price": "150"},
+    {"instant_book": "true", "max_price": "120"},
+    {"pet_friendly": "true", "bedrooms": "3", "bathrooms": "2"},
+    {"city": "seoul", "check_in": "2030-01-10", "check_out": "2030-01-15"},
+)
+
+
+class Command(BaseCommand):
+
+    help = "Measure room search latency (p50/p95), optionally seeding fake rooms first."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Number of fake rooms to create before measuring.",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=50,
+            help="Number of times each search is repeated.",
+        )
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            self.seed(options["seed"])
+
+        scenarios = list(SCENARIOS)
+        amenity_pks = list(Amenity.objects.values_list("pk", flat=True)[:2])
+        if amenity_pks:
+            scenarios.append(
+                {"city": "seoul", "amenities": ",".join(map(str, amenity_pks))}
+            )
+
+        self.stdout.write(
+            f"{Room.objects.count()} rooms on {connection.vendor}, "
+            f"{options['runs']} runs per search"
+        )
+        for params in scenarios:
+            timings = []
+            for _ in range(options["runs"]):
+                started = time.perf_counter()
+                list(
+                    filter_rooms(Room.objects.all(), params).order_by(
+                        "-created_at", "-pk"
+                    )[: settings.PAGE_SIZE]
+                )
+                timings.append((time.perf_counter() - started) * 1000)
+            p95 = (
+                statistics.quantiles(timings, n=20)[-1]
+                if len(timings) > 1
+                else timings[0]
+            )
+            self.stdout.write(
+                f"p50 {statistics.median(timings):8.2f}ms  "
+                f"p95 {p95:8.2f}ms  {params}"
+            )
+
+    def seed(self, total, batch_size=10000):
+        host, _ = User.objects.get_or_create(
+            username="benchmark-host",
+            defaults={"is_host": True},
+        )
+        created = 0
+        while created < total:
+            rooms = []
+            for _ in range(min(batch_size, total - created)):
+                country, city = random.choice(CITIES)
+                rooms.append(
+                    Room(
+                        name="Benchmark room",
+                        country=country,
+                        city=city,
+                        price=random.randint(20, 500),
+                        guests=random.randint(1, 8),
+                        beds=random.randint(1, 5),
+                        bedrooms=random.randint(1, 5),
+                        bathrooms=random.randint(1, 3),
+                        check_in="15:00",
+                        check_out="11:00",
+                        instant_book=random.random() < 0.3,
+                        pet_friendly=random.random() < 0.5,
+                        type_of_place=random.choice(Room.TypeOfPlaceChoices.values),
+                        property_type=random.choice(Room.PropertyTypeChoices.values),
+                        host=host,
+                    )
+                )
+            Room.objects.bulk_create(rooms)
+            created += len(rooms)
+            self.stdout.write(f"seeded {created}/{total} rooms")
@@ -0,0 +1,216 @@
+import csv
+import json
+import time
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from categories.models import Category
+from medias.models import Photo
+from rooms.models import Room, Amenity, Facility, HouseRule
+from rooms.serializers import RoomDetailSerializer
+from users.models import User
+
+RELATIONS = (
+    ("amenities", Amenity),
+    ("facilities", Facility),
+    ("house_rules", HouseRule),
+)
+
+
+def read_jsonl(file):
+    """(line number, row or None, error) for each non-blank line"""
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield line_number, None, f"Invalid JSON: {error}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Expected a JSON object."
+            continue
+        yield line_number, row, None
+
+
+def read_csv(file):
+    # list columns hold comma separated pks, "photos" space separated urls
+    reader = csv.DictReader(file)
+    for row in reader:
+        for field_name, _ in RELATIONS:
+            row[field_name] = [
+                pk for pk in (row.get(field_name) or "").split(",") if pk
+            ]
+        row["photos"] = [{"file": url} for url in (row.get("photos") or "").split()]
+        # the file line the row ends on, header and quoted newlines included
+        yield reader.line_num, row, None
+
+
+def clean_photos(photos):
+    """Photo fields of each entry, ValidationError if one isn't a photo"""
+    if not isinstance(photos, list):
+        raise ValidationError("photos should be a list.")
+    file_field = Photo._meta.get_field("file")
+    cleaned = []
+    for photo in photos:
+        if not isinstance(photo, dict) or not isinstance(photo.get("file"), str):
+            raise ValidationError("Each photo needs a 'file' url.")
+        description = photo.get("description") or ""
+        if not isinstance(description, str):
+            raise ValidationError("Photo description should be a string.")
+        cleaned.append(
+            {
+                "file": file_field.clean(photo["file"], None),
+                "description": description[:140],
+            }
+        )
+    return cleaned
+
+
+def as_pks(values):
+    if not isinstance(values, list):
+        return None
+    try:
+        return {int(value) for value in values}
+    except (TypeError, ValueError):
+        return None
+
+
+class Command(BaseCommand):
+
+    help = "Import rooms with their amenities, facilities, house rules and photos from a JSONL or CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=("jsonl", "csv"),
+            help="Defaults to the file extension.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rooms written per batch.",
+        )
+        parser.add_argument(
+            "--host",
+            help="Username of the host for rows without a 'host' column.",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or options["path"].rsplit(".", 1)[-1]
+        if file_format not in ("jsonl", "csv"):
+            raise CommandError("Use --format to choose between jsonl and csv.")
+        read = read_jsonl if file_format == "jsonl" else read_csv
+        self.default_host = options["host"]
+        self.imported = 0
+        self.rejected = 0
+
+        started = time.perf_counter()
+        with open(options["path"], newline="", encoding="utf-8") as file:
+            batch = []
+            for line_number, row, error in read(file):
+                if error:
+                    self.reject(line_number, error)
+                    continue
+                batch.append((line_number, row))
+                if len(batch) == options["batch_size"]:
+                    self.import_batch(batch)
+                    batch = []
+            if batch:
+                self.import_batch(batch)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{self.imported} rooms imported, {self.rejected} rejected "
+            f"in {elapsed:.1f}s ({self.imported / elapsed if elapsed else 0:.0f} rows/sec)"
+        )
+
+    def reject(self, line_number, error):
+        self.rejected += 1
+        self.stderr.write(f"line {line_number}: {error}")
+
+    def host_of(self, row):
+        username = row.get("host") or self.default_host
+        return username if isinstance(username, str) else None
+
+    def import_batch(self, batch):
+        # one lookup per related table for the whole batch
+        usernames = {self.host_of(row) for _, row in batch}
+        hosts = User.objects.in_bulk(usernames - {None}, field_name="username")
+        categories = Category.objects.filter(
+            category_type=Category.CatogoryTypeChoices.ROOM,
+        ).in_bulk(
+            {
+                category
+                for category in (row.get("category") for _, row in batch)
+                if isinstance(category, (int, str)) and category != ""
+            }
+        )
+        existing = {}
+        for field_name, model in RELATIONS:
+            pks = set()
+            for _, row in batch:
+                pks |= as_pks(row.get(field_name) or []) or set()
+            existing[field_name] = set(model.objects.in_bulk(pks))
+
+        rooms = []
+        links = []
+        for line_number, row in batch:
+            serializer = RoomDetailSerializer(data=row)
+            if not serializer.is_valid():
+                self.reject(line_number, json.dumps(serializer.errors))
+                continue
+            host = hosts.get(self.host_of(row))
+            if not host:
+                self.reject(line_number, "Host not found.")
+                continue
+            try:
+                category = categories.get(int(row.get("category")))
+            except (TypeError, ValueError):
+                category = None
+            if not category:
+                self.reject(line_number, "Category not found.")
+                continue
+            try:
+                photos = clean_photos(row.get("photos") or [])
+            except ValidationError as error:
+                self.reject(line_number, " ".join(error.messages))
+                continue
+            row_links = {}
+            for field_name, _ in RELATIONS:
+                pks = as_pks(row.get(field_name) or [])
+                if pks is None or not pks <= existing[field_name]:
+                    self.reject(line_number, f"{field_name} not found.")
+                    break
+                row_links[field_name] = pks
+            else:
+                room = Room(**serializer.validated_data, host=host, category=category)
+                # bulk_create skips Room.save()
+                room.city = str.capitalize(room.city)
+                rooms.append(room)
+                links.append((row_links, photos))
+
+        with transaction.atomic():
+            Room.objects.bulk_create(rooms)
+            for field_name, _ in RELATIONS:
+                field = Room._meta.get_field(field_name)
+                through = field.remote_field.through
+                target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+                through.objects.bulk_create(
+                    [
+                        through(room_id=room.pk, **{target: pk})
+                        for room, (row_links, _) in zip(rooms, links)
+                        for pk in row_links[field_name]
+                    ]
+                )
+            Photo.objects.bulk_create(
+                [
+                    Photo(room=room, **photo)
+                    for room, (_, photos) in zip(rooms, links)
+                    for photo in photos
+                ]
+            )
+        self.imported += len(rooms)
+        self.stdout.write(f"{self.imported} rooms imported")
@@ -0,0 +1,61 @@
+import time
+from django.core.management.base import BaseCommand
+from rooms.models import BULK_UPDATE_BATCH_SIZE, RoomBulkUpdate
+
+Status = RoomBulkUpdate.StatusChoices
+
+
+class Command(BaseCommand):
+
+    help = "Run the room bulk updates queued from the admin."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BULK_UPDATE_BATCH_SIZE,
+            help="Number of rooms updated per statement.",
+        )
+        parser.add_argument(
+            "--watch",
+            type=float,
+            metavar="SECONDS",
+            help="Keep polling for new updates at this interval.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Also pick up updates left running by a worker that died.",
+        )
+
+    def handle(self, *args, **options):
+        statuses = [Status.PENDING]
+        if options["resume"]:
+            statuses.append(Status.RUNNING)
+        while True:
+            for update in RoomBulkUpdate.objects.filter(status__in=statuses).order_by(
+                "pk"
+            ):
+                self.process(update, statuses, options["batch_size"])
+            if options["watch"] is None:
+                break
+            time.sleep(options["watch"])
+
+    def process(self, update, statuses, batch_size):
+        # claimed with a conditional UPDATE, so two workers never share one
+        claimed = RoomBulkUpdate.objects.filter(
+            pk=update.pk,
+            status__in=statuses,
+        ).update(status=Status.RUNNING)
+        if not claimed:
+            return
+        update.status = Status.RUNNING
+        try:
+            update.run(update.selected_rooms(), batch_size)
+        except Exception as error:
+            update.status = Status.FAILED
+            update.error = str(error)
+            update.save(update_fields=["status", "error", "updated_at"])
+            self.stderr.write(f"{update}: failed, {error}")
+        else:
+            self.stdout.write(f"{update}: {update.processed} updated.")
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.3 on 2026-10-18 03:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['created_at', 'id'], name='rooms_room_created_idx'),
+        ),
+    ]
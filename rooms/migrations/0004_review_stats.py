@@ -0,0 +1,41 @@
+# Generated by Django 4.1.3 on 2026-10-18 03:18
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_review_stats(apps, schema_editor):
+    Room = apps.get_model("rooms", "Room")
+    Review = apps.get_model("reviews", "Review")
+    reviews = Review.objects.filter(room=OuterRef("pk")).order_by().values("room")
+    Room.objects.update(
+        review_count=Coalesce(
+            Subquery(reviews.annotate(count=Count("pk")).values("count")), 0
+        ),
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum("rating")).values("total")), 0
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_review_room_created_index'),
+        ('rooms', '0003_room_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='room',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_review_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.1.3 on 2026-10-18 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0004_review_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['city', 'price'], name='rooms_city_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['country', 'city', 'price'], name='rooms_country_city_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['category', 'price'], name='rooms_category_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['property_type', 'type_of_place', 'price'], name='rooms_kind_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(condition=models.Q(('instant_book', True)), fields=['price'], name='rooms_instant_book_price_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.1.3 on 2026-10-18 03:32
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from common.models import STARS, star_count_field, star_filter
+
+
+def backfill_histogram(apps, schema_editor):
+    Room = apps.get_model("rooms", "Room")
+    Review = apps.get_model("reviews", "Review")
+    reviews = Review.objects.filter(room=OuterRef("pk")).order_by().values("room")
+    Room.objects.update(
+        **{
+            star_count_field(star): Coalesce(
+                Subquery(
+                    reviews.annotate(
+                        count=Count("pk", filter=star_filter(star))
+                    ).values("count")
+                ),
+                0,
+            )
+            for star in STARS
+        }
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0005_room_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="room",
+            name="rating_1_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="rating_2_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="rating_3_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="rating_4_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="rating_5_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_histogram, migrations.RunPython.noop),
+    ]
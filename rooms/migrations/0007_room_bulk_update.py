@@ -0,0 +1,90 @@
+# Generated by Django 4.1.3 on 2026-10-18 03:43
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("rooms", "0006_review_histogram"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoomBulkUpdate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("set_price", "Set price"),
+                            ("change_price", "Change price by percent"),
+                            ("toggle_instant_book", "Toggle instant book"),
+                            ("toggle_pet_friendly", "Toggle pet friendly"),
+                            ("set_category", "Reassign category"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("value", models.IntegerField(blank=True, null=True)),
+                ("pks", models.JSONField(blank=True, editable=False, null=True)),
+                ("params", models.TextField(blank=True, editable=False)),
+                ("max_pk", models.BigIntegerField(default=0, editable=False)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("processed", models.PositiveIntegerField(default=0)),
+                ("last_pk", models.BigIntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="categories.category",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Room Bulk Update",
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.1.3 on 2026-10-18 04:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0007_room_bulk_update"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="room",
+            name="rooms_city_price_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="room",
+            name="rooms_country_city_price_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="room",
+            name="rooms_category_price_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="room",
+            name="rooms_kind_price_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="room",
+            name="rooms_instant_book_price_idx",
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["city", "-created_at", "-id"], name="rooms_city_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["category", "-created_at", "-id"],
+                name="rooms_category_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["property_type", "type_of_place", "-created_at", "-id"],
+                name="rooms_kind_created_idx",
+            ),
+        ),
+    ]
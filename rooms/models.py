@@ -1,6 +1,12 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Q, Value, When
+from django.db.models.functions import Cast, Round
+from django.http import QueryDict
 from django.urls import reverse
-from common.models import AbstractTimeStamp
+from django.utils import timezone
+from django.utils.text import smart_split, unescape_string_literal
+from common.models import AbstractTimeStamp, AbstractReviewStats
 
 
 class AbstractItem(AbstractTimeStamp):
@@ -20,7 +26,76 @@ class AbstractItem(AbstractTimeStamp):
         return self.name
 
 
-class Room(AbstractTimeStamp):
+# the numeric columns RoomAdmin filters by range
+RANGE_FILTER_FIELDS = ("price", "guests", "beds", "bedrooms", "bathrooms")
+
+
+class RoomQuerySet(models.QuerySet):
+    """Room QuerySet Definition"""
+
+    def with_is_liked(self, user):
+        if not user.is_authenticated:
+            return self.annotate(is_liked=Value(False))
+        return self.annotate(
+            is_liked=Exists(
+                Room.wishlists.through.objects.filter(
+                    room_id=OuterRef("pk"),
+                    wishlist__user=user,
+                )
+            )
+        )
+
+    def for_list(self, user):
+        """Everything RoomListSerializer reads, in a constant number of queries"""
+        return self.with_is_liked(user).prefetch_related("photos")
+
+    def for_wishlist(self):
+        """for_list of rooms read through the user's own wishlist: all liked"""
+        return self.annotate(is_liked=Value(True)).prefetch_related("photos")
+
+    def in_city(self, city):
+        # stored the way Room.save writes it, so the city index is used
+        return self.filter(city=str.capitalize(city.strip()))
+
+    def hosted_by(self, username):
+        return self.filter(host__username=username.strip())
+
+    def search(self, terms):
+        """The admin search: every word matches the name, city, price or host"""
+        rooms = self
+        for term in smart_split(terms):
+            if term[0] in "\"'" and term[0] == term[-1]:
+                term = unescape_string_literal(term)
+            rooms = rooms.filter(
+                Q(name__icontains=term)
+                | Q(city__iexact=term)
+                | Q(price__istartswith=term)
+                | Q(host__username__istartswith=term)
+            )
+        return rooms
+
+    def matching(self, params):
+        """The rooms a RoomAdmin changelist query string selects"""
+        params = QueryDict(params)
+        rooms = self
+        if params.get("city"):
+            rooms = rooms.in_city(params["city"])
+        if params.get("host"):
+            rooms = rooms.hosted_by(params["host"])
+        lookups = [
+            f"{field}__{lookup}"
+            for field in RANGE_FILTER_FIELDS
+            for lookup in ("gte", "lte")
+        ]
+        for lookup in [*lookups, "instant_book__exact"]:
+            if params.get(lookup):
+                rooms = rooms.filter(**{lookup: params[lookup]})
+        if params.get("q"):
+            rooms = rooms.search(params["q"])
+        return rooms
+
+
+class Room(AbstractTimeStamp, AbstractReviewStats):
     """Room Model Definition"""
 
     class TypeOfPlaceChoices(models.TextChoices):
@@ -108,24 +183,37 @@ class Room(AbstractTimeStamp):
         related_name="categories",
     )
 
+    objects = RoomQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="rooms_room_created_idx",
+            ),
+            # room search (rooms.filters): the list is read newest first, so an
+            # equality filter followed by the order reads one page and stops;
+            # range filters (price, guests, ...) are checked on the rows read
+            models.Index(
+                fields=["city", "-created_at", "-id"],
+                name="rooms_city_created_idx",
+            ),
+            models.Index(
+                fields=["category", "-created_at", "-id"],
+                name="rooms_category_created_idx",
+            ),
+            models.Index(
+                fields=["property_type", "type_of_place", "-created_at", "-id"],
+                name="rooms_kind_created_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.name
 
     def total_amenities(self):
         return self.amenities.count()
 
-    def review_rating(self):
-        count = self.reviews.count()
-        if count == 0:
-            return 0
-
-        total_rating = 0
-        for review in self.reviews.all().values("rating"):
-            total_rating += review["rating"]
-        return round(total_rating / count, 2)
-
-    review_rating.short_description = "Rating"
-
     def save(self, *args, **kwargs):
         self.city = str.capitalize(self.city)
         super().save(*args, **kwargs)
@@ -153,3 +241,139 @@ class HouseRule(AbstractItem):
 
     class Meta:
         verbose_name = "House Rule"
+
+
+# rooms updated per statement by a queued RoomBulkUpdate
+BULK_UPDATE_BATCH_SIZE = getattr(settings, "ROOMS_BULK_UPDATE_BATCH_SIZE", 5000)
+
+
+class RoomBulkUpdate(AbstractTimeStamp):
+    """RoomBulkUpdate Model Definition, an admin action run by a worker
+
+    Small selections are updated right away by apply(); larger ones are
+    saved as the checked pks, or as the changelist query string and the
+    highest room pk at the time, and worked through in pk order by the
+    process_room_updates command.
+    """
+
+    class ActionChoices(models.TextChoices):
+        SET_PRICE = ("set_price", "Set price")
+        CHANGE_PRICE = ("change_price", "Change price by percent")
+        TOGGLE_INSTANT_BOOK = ("toggle_instant_book", "Toggle instant book")
+        TOGGLE_PET_FRIENDLY = ("toggle_pet_friendly", "Toggle pet friendly")
+        SET_CATEGORY = ("set_category", "Reassign category")
+
+    class StatusChoices(models.TextChoices):
+        PENDING = ("pending", "Pending")
+        RUNNING = ("running", "Running")
+        DONE = ("done", "Done")
+        FAILED = ("failed", "Failed")
+
+    action = models.CharField(
+        max_length=20,
+        choices=ActionChoices.choices,
+    )
+    # the price or the percent, depending on the action
+    value = models.IntegerField(
+        null=True,
+        blank=True,
+    )
+    category = models.ForeignKey(
+        "categories.Category",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    # the checked rooms, or None for every room the changelist matched
+    pks = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    params = models.TextField(
+        blank=True,
+        editable=False,
+    )
+    # rooms created after the update was queued are left alone
+    max_pk = models.BigIntegerField(
+        default=0,
+        editable=False,
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=StatusChoices.choices,
+        default=StatusChoices.PENDING,
+    )
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    last_pk = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        "users.User",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+
+    class Meta:
+        verbose_name = "Room Bulk Update"
+
+    def __str__(self) -> str:
+        return f"{self.get_action_display()} on {self.total} rooms"
+
+    def changes(self):
+        if self.action == self.ActionChoices.SET_PRICE:
+            return {"price": self.value}
+        if self.action == self.ActionChoices.CHANGE_PRICE:
+            return {
+                "price": Cast(
+                    Round(F("price") * Value((100 + self.value) / 100)),
+                    IntegerField(),
+                )
+            }
+        if self.action == self.ActionChoices.TOGGLE_INSTANT_BOOK:
+            return {"instant_book": toggled("instant_book")}
+        if self.action == self.ActionChoices.TOGGLE_PET_FRIENDLY:
+            return {"pet_friendly": toggled("pet_friendly")}
+        if self.action == self.ActionChoices.SET_CATEGORY:
+            return {"category": self.category}
+        raise ValueError(f"Unknown action {self.action}")
+
+    def selected_rooms(self):
+        """The rooms this update runs on, rebuilt from the admin's selection"""
+        if self.pks is not None:
+            return Room.objects.filter(pk__in=self.pks)
+        if not self.max_pk:
+            raise ValueError("The update has no selection.")
+        return Room.objects.matching(self.params).filter(pk__lte=self.max_pk)
+
+    def apply(self, rooms):
+        """One UPDATE; update() skips auto_now, so updated_at is set here"""
+        return rooms.update(updated_at=timezone.now(), **self.changes())
+
+    def run(self, rooms, batch_size=BULK_UPDATE_BATCH_SIZE):
+        """Update rooms batch by batch, resuming after last_pk"""
+        while True:
+            pks = list(
+                rooms.filter(pk__gt=self.last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            with transaction.atomic():
+                self.apply(Room.objects.filter(pk__in=pks))
+                self.processed += len(pks)
+                self.last_pk = pks[-1]
+                self.save(update_fields=["processed", "last_pk", "updated_at"])
+        self.status = self.StatusChoices.DONE
+        self.save(update_fields=["status", "updated_at"])
+
+
+def toggled(field):
+    return Case(
+        When(**{field: True}, then=Value(False)),
+        default=Value(True),
+    )
@@ -1,10 +1,12 @@
+import datetime
 import typing
 import strawberry
 from strawberry.types import Info
 from django.db import transaction
 from enum import Enum
-from .models import Room, Amenity
+from .models import Room, Amenity, Facility, HouseRule
 from categories.models import Category
+from common.m2m import sync_m2m
 
 
 @strawberry.enum
@@ -24,7 +26,6 @@ class PropertyTypeChoices(Enum):
 
 
 def add_room(
-    rooms: int,
     name: str,
     description: str,
     country: str,
@@ -35,10 +36,12 @@ def add_room(
     beds: int,
     bedrooms: int,
     bathrooms: int,
+    check_in: datetime.time,
+    check_out: datetime.time,
     instant_book: bool,
     pet_friendly: bool,
     type_of_place: TypeOfPlaceChoices,
-    property_type: TypeOfPlaceChoices,
+    property_type: PropertyTypeChoices,
     amenities: typing.List[int],
     facilities: typing.List[int],
     house_rules: typing.List[int],
@@ -47,41 +50,41 @@ def add_room(
 ):
     try:
         category = Category.objects.get(pk=category_pk)
-        if category.kind == Category.CategoryKindChoices.EXPERIENCES:
+        if category.category_type == Category.CatogoryTypeChoices.EXPERIENCES:
             raise Exception("The category type should be rooms")
     except Category.DoesNotExist:
-        raise Exception(detail="Category does not found.")
+        raise Exception("Category does not found.")
 
-    try:
-        with transaction.atomic():
-            room = Room.objects.create(
-                rooms=rooms,
-                name=name,
-                description=description,
-                country=country,
-                city=city,
-                address=address,
-                price=price,
-                guests=guests,
-                beds=beds,
-                bedrooms=bedrooms,
-                bathrooms=bathrooms,
-                instant_book=instant_book,
-                type_of_place=TypeOfPlaceChoices,
-                property_type=property_type,
-                amenities=amenities,
-                facilities=facilities,
-                house_rules=house_rules,
-                category=category,
-                owner=info.context.request.user,
-            )
-
-            for amenity_pk in amenities:
-                amenity = Amenity.objects.get(pk=amenity_pk)
-                room.amenities.add(amenity)
+    with transaction.atomic():
+        room = Room.objects.create(
+            name=name,
+            description=description,
+            country=country,
+            city=city,
+            address=address,
+            price=price,
+            guests=guests,
+            beds=beds,
+            bedrooms=bedrooms,
+            bathrooms=bathrooms,
+            check_in=check_in,
+            check_out=check_out,
+            instant_book=instant_book,
+            pet_friendly=pet_friendly,
+            type_of_place=type_of_place.value,
+            property_type=property_type.value,
+            category=category,
+            host=info.context.request.user,
+        )
 
-            room.save()
+        for field_name, model, pks in (
+            ("amenities", Amenity, amenities),
+            ("facilities", Facility, facilities),
+            ("house_rules", HouseRule, house_rules),
+        ):
+            try:
+                sync_m2m(room, field_name, pks)
+            except model.DoesNotExist:
+                raise Exception(f"{model._meta.verbose_name} does not found.")
 
-            return room
-    except Exception:
-        raise Exception("amenity does not found.")
+        return room
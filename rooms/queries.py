@@ -1,12 +1,89 @@
+import datetime
+import typing
+from strawberry.types import Info
+from common.paginations import after_cursor, encode_cursor
 from . import models
+from .filters import filter_rooms
+from .loaders import get_loaders
+from .mutations import TypeOfPlaceChoices, PropertyTypeChoices
+from .types import RoomConnection, RoomEdge, PageInfo
 
+MAX_FIRST = 100
 
-def get_all_rooms():
-    return models.Room.objects.all()
 
+def get_all_rooms(
+    info: Info,
+    first: int = 20,
+    after: typing.Optional[str] = None,
+    min_price: typing.Optional[int] = None,
+    max_price: typing.Optional[int] = None,
+    city: typing.Optional[str] = None,
+    country: typing.Optional[str] = None,
+    guests: typing.Optional[int] = None,
+    beds: typing.Optional[int] = None,
+    bedrooms: typing.Optional[int] = None,
+    bathrooms: typing.Optional[int] = None,
+    type_of_place: typing.Optional[TypeOfPlaceChoices] = None,
+    property_type: typing.Optional[PropertyTypeChoices] = None,
+    instant_book: typing.Optional[bool] = None,
+    pet_friendly: typing.Optional[bool] = None,
+    category: typing.Optional[int] = None,
+    amenities: typing.Optional[typing.List[int]] = None,
+    check_in: typing.Optional[datetime.date] = None,
+    check_out: typing.Optional[datetime.date] = None,
+) -> RoomConnection:
+    if not 0 < first <= MAX_FIRST:
+        raise Exception(f"'first' should be from 1 to {MAX_FIRST}.")
 
-def get_room(pk: int):
+    params = {
+        "min_price": min_price,
+        "max_price": max_price,
+        "city": city,
+        "country": country,
+        "guests": guests,
+        "beds": beds,
+        "bedrooms": bedrooms,
+        "bathrooms": bathrooms,
+        "type_of_place": type_of_place and type_of_place.value,
+        "property_type": property_type and property_type.value,
+        "instant_book": instant_book,
+        "pet_friendly": pet_friendly,
+        "category": category,
+        "amenities": amenities,
+        "check_in": check_in,
+        "check_out": check_out,
+    }
+    all_rooms = filter_rooms(
+        models.Room.objects.all(),
+        {name: value for name, value in params.items() if value is not None},
+    )
+
+    page = all_rooms.order_by("-created_at", "-pk")
+    if after:
+        try:
+            page = after_cursor(page, after)
+        except ValueError as e:
+            raise Exception(str(e))
+    rooms = list(page[: first + 1])
+    has_next_page = len(rooms) > first
+    rooms = rooms[:first]
+    get_loaders(info).prime(rooms)
+
+    edges = [RoomEdge(cursor=encode_cursor(room), node=room) for room in rooms]
+    return RoomConnection(
+        edges=edges,
+        page_info=PageInfo(
+            has_next_page=has_next_page,
+            end_cursor=edges[-1].cursor if edges else None,
+        ),
+        rooms=all_rooms,
+    )
+
+
+def get_room(pk: int, info: Info):
     try:
-        return models.Room.objects.get(pk=pk)
+        room = models.Room.objects.get(pk=pk)
     except models.Room.DoesNotExist:
-        raise Exception(detail="Room does not found.")
+        raise Exception("Room does not found.")
+    get_loaders(info).prime([room])
+    return room
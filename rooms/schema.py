@@ -8,7 +8,7 @@ from common.permissions import OnlyLoggedIn
 
 @strawberry.type
 class Query:
-    all_rooms: typing.List[types.RoomType] = strawberry.field(
+    all_rooms: types.RoomConnection = strawberry.field(
         resolver=queries.get_all_rooms,
     )
     room: typing.Optional[types.RoomType] = strawberry.field(
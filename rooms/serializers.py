@@ -3,8 +3,17 @@ from .models import Room, Amenity, Facility, HouseRule
 from users.serializers import TinyUserSerializer
 from categories.serializers import CategorySerializer
 from medias.serializers import PhotoSerializer
+from common.models import STARS, star_count_field
 from wishlists.models import Wishlist
 
+# counters kept by reviews.signals; the API serves review_rating and
+# /rooms/<pk>/reviews/stats instead
+REVIEW_STATS_FIELDS = (
+    "review_count",
+    "rating_sum",
+    *(star_count_field(star) for star in STARS),
+)
+
 
 class AmenitySerializer(ModelSerializer):
     class Meta:
@@ -36,7 +45,7 @@ class HouseRuleSerializer(ModelSerializer):
 class RoomSerializer(ModelSerializer):
     class Meta:
         model = Room
-        fields = "__all__"
+        exclude = REVIEW_STATS_FIELDS
         depth = 1
 
 
@@ -65,9 +74,11 @@ class RoomListSerializer(ModelSerializer):
 
     def get_is_host(self, room):
         request = self.context["request"]
-        return room.host == request.user
+        return room.host_id == request.user.pk
 
     def get_is_liked(self, room):
+        if hasattr(room, "is_liked"):
+            return room.is_liked
         request = self.context["request"]
         return Wishlist.objects.filter(
             user=request.user,
@@ -88,16 +99,18 @@ class RoomDetailSerializer(ModelSerializer):
 
     class Meta:
         model = Room
-        fields = "__all__"
+        exclude = REVIEW_STATS_FIELDS
 
     def get_review_rating(self, room):
         return room.review_rating()
 
     def get_is_host(self, room):
         request = self.context["request"]
-        return room.host == request.user
+        return room.host_id == request.user.pk
 
     def get_is_liked(self, room):
+        if hasattr(room, "is_liked"):
+            return room.is_liked
         request = self.context["request"]
         return Wishlist.objects.filter(
             user=request.user,
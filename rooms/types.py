@@ -1,10 +1,9 @@
-from django.conf import settings
 import strawberry
 from strawberry.types import Info
 from strawberry import auto
 import typing
 from . import models
-from wishlists.models import Wishlist
+from .loaders import get_loaders
 from users.types import UserType
 from reviews.types import ReviewType
 
@@ -14,14 +13,18 @@ class RoomType:
     id: auto
     name: auto
     property_type: auto
-    host: "UserType"
 
     @strawberry.field
-    def reviews(self, page: typing.Optional[int] = 1) -> typing.List["ReviewType"]:
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
-        return self.reviews.all()[start:end]
+    def host(self, info: Info) -> "UserType":
+        return get_loaders(info).hosts.load(self.host_id)
+
+    @strawberry.field
+    def reviews(
+        self,
+        info: Info,
+        page: typing.Optional[int] = 1,
+    ) -> typing.List["ReviewType"]:
+        return get_loaders(info).reviews(self.pk, page)
 
     @strawberry.field
     def rating(self) -> str:
@@ -29,11 +32,32 @@ class RoomType:
 
     @strawberry.field
     def is_host(self, info: Info) -> bool:
-        return self.host == info.context.request.user
+        return self.host_id == info.context.request.user.pk
 
     @strawberry.field
     def is_liked(self, info: Info) -> bool:
-        return Wishlist.objects.filter(
-            user=info.context.request.user,
-            rooms__pk=self.pk,
-        ).exists()
+        return get_loaders(info).is_liked.load(self.pk)
+
+
+@strawberry.type
+class PageInfo:
+    has_next_page: bool
+    end_cursor: typing.Optional[str]
+
+
+@strawberry.type
+class RoomEdge:
+    cursor: str
+    node: RoomType
+
+
+@strawberry.type
+class RoomConnection:
+    edges: typing.List[RoomEdge]
+    page_info: PageInfo
+    rooms: strawberry.Private[typing.Any]
+
+    @strawberry.field
+    def total_count(self) -> int:
+        # only counted when the query asks for it
+        return self.rooms.count()
@@ -1,5 +1,8 @@
-from django.conf import settings
+import datetime
+from asgiref.sync import sync_to_async
 from django.db import transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.utils.http import http_date
 from django.utils import timezone
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.views import APIView
@@ -7,6 +10,7 @@ from rest_framework import status
 from rest_framework import exceptions
 from rest_framework.response import Response
 from .models import Room, Amenity, Facility, HouseRule
+from .filters import filter_rooms
 from .serializers import (
     RoomListSerializer,
     RoomDetailSerializer,
@@ -15,19 +19,29 @@ from .serializers import (
     HouseRuleSerializer,
 )
 from categories.models import Category
+from common.cache import catalogue_response, is_not_modified, make_etag
+from common.m2m import sync_m2m, through_fields
+from common.models import STARS, star_count_field
+from common.paginations import CreatedAtCursorPagination
+from common.views import AsyncAPIView
+from reviews.models import Review
 from reviews.serializers import ReviewSerializer
+from medias.models import Photo
 from medias.serializers import PhotoSerializer
 
 # from medias.serializers import PhotoSerializer, VideoSerializer
-from bookings.models import Booking
+from bookings.models import Booking, CalendarMonth
+from bookings.calendars import MAX_MONTHS, days_to_string, next_month
 from bookings.serializers import PublicBookingSerializer, CreateRoomBookingSerializer
 
 
 class Amenities(APIView):
     def get(self, request):
-        all_amenities = Amenity.objects.all()
-        serializer = AmenitySerializer(all_amenities, many=True)
-        return Response(serializer.data)
+        return catalogue_response(
+            request,
+            Amenity,
+            lambda: AmenitySerializer(Amenity.objects.all(), many=True).data,
+        )
 
     def post(self, request):
         serializer = AmenitySerializer(data=request.data)
@@ -73,9 +87,11 @@ class AmenityDetail(APIView):
 
 class Facilities(APIView):
     def get(self, request):
-        all_facilities = Facility.objects.all()
-        serializer = FacilitySerializer(all_facilities, many=True)
-        return Response(serializer.data)
+        return catalogue_response(
+            request,
+            Facility,
+            lambda: FacilitySerializer(Facility.objects.all(), many=True).data,
+        )
 
     def post(self, request):
         serializer = FacilitySerializer(data=request.data)
@@ -121,9 +137,11 @@ class FacilityDetail(APIView):
 
 class HouseRules(APIView):
     def get(self, request):
-        all_houserules = HouseRule.objects.all()
-        serializer = HouseRuleSerializer(all_houserules, many=True)
-        return Response(serializer.data)
+        return catalogue_response(
+            request,
+            HouseRule,
+            lambda: HouseRuleSerializer(HouseRule.objects.all(), many=True).data,
+        )
 
     def post(self, request):
         serializer = HouseRuleSerializer(data=request.data)
@@ -167,18 +185,54 @@ class HouseRuleDetail(APIView):
         return Response(status=status.HTTP_200_OK)
 
 
-class Rooms(APIView):
+def sync_room_items(room, data):
+    """Apply the amenities / facilities / house_rules pk lists of a request
+
+    A missing key leaves that relation alone. sync_m2m writes the through
+    table directly but still sends m2m_changed.
+    """
+    for field_name, model, error in (
+        ("amenities", Amenity, "Amenity not found."),
+        ("facilities", Facility, "facility not found."),
+        ("house_rules", HouseRule, "House rule not found."),
+    ):
+        if field_name not in data:
+            continue
+        pks = data[field_name]
+        if type(pks) is not list:
+            raise exceptions.ParseError(f"{field_name} should be a list.")
+        try:
+            sync_m2m(room, field_name, pks)
+        except model.DoesNotExist:
+            raise exceptions.ParseError(error)
+
+
+async def aget_room(pk):
+    try:
+        return await Room.objects.aget(pk=pk)
+    except Room.DoesNotExist:
+        raise exceptions.NotFound
+
+
+class Rooms(AsyncAPIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-    def get(self, request):
-        all_rooms = Room.objects.all()
+    async def get(self, request):
+        all_rooms = filter_rooms(
+            Room.objects.for_list(request.user),
+            request.query_params,
+        )
+        paginator = CreatedAtCursorPagination()
+        page = await sync_to_async(paginator.paginate_queryset)(
+            all_rooms, request, view=self
+        )
         serializer = RoomListSerializer(
-            all_rooms,
+            page,
             many=True,
             context={"request": request},
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = RoomDetailSerializer(
@@ -200,33 +254,11 @@ class Rooms(APIView):
             raise exceptions.ParseError("Category not found.")
 
         with transaction.atomic():
-            try:
-                room = serializer.save(
-                    host=request.user,
-                    category=category,
-                )
-                amenities = request.data.get("amenities")
-                for amenity_pk in amenities:
-                    amenity = Amenity.objects.get(pk=amenity_pk)
-                    room.amenities.add(amenity)
-            except Exception:
-                raise exceptions.ParseError("Amenity not found.")
-
-            try:
-                facilities = request.data.get("facilities")
-                for facility_pk in facilities:
-                    facility = Facility.objects.get(pk=facility_pk)
-                    room.facilities.add(facility)
-            except Exception:
-                raise exceptions.ParseError("facility not found.")
-
-            try:
-                house_rules = request.data.get("house_rules")
-                for house_rule_pk in house_rules:
-                    house_rule = HouseRule.objects.get(pk=house_rule_pk)
-                    room.house_rules.add(house_rule)
-            except Exception:
-                raise exceptions.ParseError("House rule not found.")
+            room = serializer.save(
+                host=request.user,
+                category=category,
+            )
+            sync_room_items(room, request.data)
 
         serializer = RoomDetailSerializer(
             room,
@@ -235,7 +267,7 @@ class Rooms(APIView):
         return Response(serializer.data)
 
 
-class RoomDetail(APIView):
+class RoomDetail(AsyncAPIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
 
@@ -251,13 +283,100 @@ class RoomDetail(APIView):
         except Category.DoesNotExist:
             raise exceptions.NotFound
 
-    def get(self, request, pk):
-        room = self.get_object(pk)
+    def get_links(self, pk):
+        """The sorted pks of each relation of the room, in one query
+
+        Unlinking an item that isn't the newest changes no updated_at, and
+        counts or sums of pks collide, so the ETag takes the pks themselves.
+        """
+        links = (
+            Photo.objects.filter(room=pk)
+            .annotate(relation=Value("photos"))
+            .values_list("relation", "pk")
+        )
+        for name in ("amenities", "facilities", "house_rules"):
+            through, source, target = through_fields(Room, name)
+            links = links.union(
+                through.objects.filter(**{source: pk})
+                .annotate(relation=Value(name))
+                .values_list("relation", target),
+                all=True,
+            )
+        linked = {}
+        for relation, item_pk in links:
+            linked.setdefault(relation, []).append(item_pk)
+        return {f"{name}_pks": sorted(pks) for name, pks in sorted(linked.items())}
+
+    def get_state(self, pk, user):
+        """Everything the detail payload depends on, in two cheap queries"""
+
+        def latest(items):
+            return Subquery(items.order_by("-updated_at").values("updated_at")[:1])
+
+        state = (
+            Room.objects.with_is_liked(user)
+            .filter(pk=pk)
+            .annotate(
+                photos_changed_at=latest(Photo.objects.filter(room=OuterRef("pk"))),
+                amenities_changed_at=latest(
+                    Amenity.objects.filter(amenities=OuterRef("pk"))
+                ),
+                facilities_changed_at=latest(
+                    Facility.objects.filter(facilities=OuterRef("pk"))
+                ),
+                house_rules_changed_at=latest(
+                    HouseRule.objects.filter(house_rules=OuterRef("pk"))
+                ),
+            )
+            .values(
+                "updated_at",
+                "photos_changed_at",
+                "amenities_changed_at",
+                "facilities_changed_at",
+                "house_rules_changed_at",
+                "category__updated_at",
+                "review_count",
+                "rating_sum",
+                "host__name",
+                "host__avatar",
+                "host__username",
+                "is_liked",
+            )
+            .first()
+        )
+        if not state:
+            raise exceptions.NotFound
+        return {**state, **self.get_links(pk)}
+
+    async def get(self, request, pk):
+        state = await sync_to_async(self.get_state)(pk, request.user)
+        last_modified = max(
+            changed_at
+            for name, changed_at in state.items()
+            if name.endswith("updated_at") or name.endswith("changed_at")
+            if changed_at
+        )
+        headers = {
+            "ETag": make_etag(request.user.pk, *state.values()),
+            "Last-Modified": http_date(last_modified.timestamp()),
+        }
+        if is_not_modified(request, headers["ETag"]):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        try:
+            room = await (
+                Room.objects.with_is_liked(request.user)
+                .select_related("host", "category")
+                .prefetch_related("amenities", "facilities", "house_rules", "photos")
+                .aget(pk=pk)
+            )
+        except Room.DoesNotExist:
+            raise exceptions.NotFound
         serializer = RoomDetailSerializer(
             room,
             context={"request": request},
         )
-        return Response(serializer.data)
+        return Response(serializer.data, headers=headers)
 
     def put(self, request, pk):
         room = self.get_object(pk)
@@ -282,44 +401,14 @@ class RoomDetail(APIView):
             except Category.DoesNotExist:
                 raise exceptions.ParseError("Category not found.")
         else:
-            category = self.get_category_object(room.category)
+            category = room.category
 
         with transaction.atomic():
-            try:
-                room = serializer.save(
-                    host=request.user,
-                    category=category,
-                )
-                amenities = request.data.get("amenities")
-                if type(amenities) is list:
-                    print(type(amenities))
-                    print(RoomAmenities)
-                    room.amenities.clear()
-                    for amenity_pk in amenities:
-                        amenity = Amenity.objects.get(pk=amenity_pk)
-                        room.amenities.add(amenity)
-            except Exception:
-                raise exceptions.ParseError("Amenity not found.")
-
-            try:
-                facilities = request.data.get("facilities")
-                if type(facilities) is list:
-                    room.facilities.clear()
-                    for facility_pk in facilities:
-                        facility = Facility.objects.get(pk=facility_pk)
-                        room.facilities.add(facility)
-            except Exception:
-                raise exceptions.ParseError("facility not found.")
-
-            try:
-                house_rules = request.data.get("house_rules")
-                if type(house_rules) is list:
-                    room.house_rules.clear()
-                    for house_rule_pk in house_rules:
-                        house_rule = HouseRule.objects.get(pk=house_rule_pk)
-                        room.house_rules.add(house_rule)
-            except Exception:
-                raise exceptions.ParseError("House rule not found.")
+            room = serializer.save(
+                host=request.user,
+                category=category,
+            )
+            sync_room_items(room, request.data)
 
         serializer = RoomDetailSerializer(
             room,
@@ -335,7 +424,7 @@ class RoomDetail(APIView):
         return Response(status=status.HTTP_200_OK)
 
 
-class RoomReviews(APIView):
+class RoomReviews(AsyncAPIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
 
@@ -345,23 +434,19 @@ class RoomReviews(APIView):
         except Room.DoesNotExist:
             raise exceptions.NotFound
 
-    def get(self, request, pk):
-        try:
-            page = request.query_params.get("page", 1)
-            page = int(page)
-        except ValueError:
-            page = 1
-
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
-
-        room = self.get_object(pk)
+    async def get(self, request, pk):
+        room = await aget_room(pk)
+        paginator = CreatedAtCursorPagination()
+        page = await sync_to_async(paginator.paginate_queryset)(
+            Review.objects.filter(room=room).for_list(),
+            request,
+            view=self,
+        )
         serialzer = ReviewSerializer(
-            room.reviews.all()[start:end],
+            page,
             many=True,
         )
-        return Response(serialzer.data)
+        return paginator.get_paginated_response(serialzer.data)
 
     def post(self, request, pk):
         serializer = ReviewSerializer(data=request.data)
@@ -376,6 +461,28 @@ class RoomReviews(APIView):
         return Response(serializer.data)
 
 
+class RoomReviewStats(AsyncAPIView):
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    async def get(self, request, pk):
+        try:
+            room = await Room.objects.only(
+                "review_count",
+                "rating_sum",
+                *(star_count_field(star) for star in STARS),
+            ).aget(pk=pk)
+        except Room.DoesNotExist:
+            raise exceptions.NotFound
+        return Response(
+            {
+                "count": room.review_count,
+                "rating": room.review_rating(),
+                "histogram": room.rating_histogram(),
+            }
+        )
+
+
 class RoomAmenities(APIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -387,22 +494,14 @@ class RoomAmenities(APIView):
             raise exceptions.NotFound
 
     def get(self, request, pk):
-        try:
-            page = request.query_params.get("page", 1)
-            page = int(page)
-        except ValueError:
-            page = 1
-
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
-
         room = self.get_object(pk)
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(room.amenities.all(), request, view=self)
         serialzer = AmenitySerializer(
-            room.amenities.all()[start:end],
+            page,
             many=True,
         )
-        return Response(serialzer.data)
+        return paginator.get_paginated_response(serialzer.data)
 
     def post(self, request, pk):
         serializer = AmenitySerializer(data=request.data)
@@ -438,7 +537,52 @@ class RoomPhotos(APIView):
         return Response(serialzer.data)
 
 
-class RoomBookings(APIView):
+class RoomBookings(AsyncAPIView):
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    async def get(self, request, pk):
+        room = await aget_room(pk)
+        now = timezone.localtime(timezone.now()).date()
+        bookings = [
+            booking
+            async for booking in Booking.objects.filter(
+                room=room,
+                booking_type=Booking.BookingTypeChoices.ROOM,
+                check_in__gt=now,
+            )
+        ]
+        serializer = PublicBookingSerializer(bookings, many=True)
+        return Response(serializer.data)
+
+    def get_locked_object(self, pk):
+        try:
+            return Room.objects.select_for_update().get(pk=pk)
+        except Room.DoesNotExist:
+            raise exceptions.NotFound
+
+    def post(self, request, pk):
+        with transaction.atomic():
+            # the room row lock serializes bookings of the same room only
+            room = self.get_locked_object(pk)
+
+            serializer = CreateRoomBookingSerializer(
+                data=request.data,
+                context={"room": room},
+            )
+            if not serializer.is_valid():
+                return Response(serializer.errors)
+
+            booking = serializer.save(
+                room=room,
+                user=request.user,
+                booking_type=Booking.BookingTypeChoices.ROOM,
+            )
+        serialzer = CreateRoomBookingSerializer(booking)
+        return Response(serialzer.data)
+
+
+class RoomCalendar(APIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
 
@@ -450,26 +594,42 @@ class RoomBookings(APIView):
 
     def get(self, request, pk):
         room = self.get_object(pk)
-        now = timezone.localtime(timezone.now()).date()
-        bookings = Booking.objects.filter(
-            room=room,
-            booking_type=Booking.BookingTypeChoices.ROOM,
-            check_in__gt=now,
-        )
-        serializer = PublicBookingSerializer(bookings, many=True)
-        return Response(serializer.data)
 
-    def post(self, request, pk):
-        room = self.get_object(pk)
-
-        serializer = CreateRoomBookingSerializer(data=request.data)
-        if not serializer.is_valid():
-            return Response(serializer.errors)
+        first_month = request.query_params.get("from")
+        if first_month:
+            try:
+                first_month = datetime.datetime.strptime(first_month, "%Y-%m").date()
+            except ValueError:
+                raise exceptions.ParseError("'from' should look like YYYY-MM.")
+        else:
+            first_month = timezone.localtime(timezone.now()).date().replace(day=1)
 
-        booking = serializer.save(
-            room=room,
-            user=request.user,
-            kind=Booking.BookingKindChoices.ROOM,
+        try:
+            months = int(request.query_params.get("months", 1))
+        except ValueError:
+            raise exceptions.ParseError("'months' should be a number.")
+        if not 1 <= months <= MAX_MONTHS:
+            raise exceptions.ParseError(f"'months' should be from 1 to {MAX_MONTHS}.")
+
+        all_months = [first_month]
+        for _ in range(months - 1):
+            all_months.append(next_month(all_months[-1]))
+        booked = dict(
+            CalendarMonth.objects.filter(
+                room=room,
+                month__gte=all_months[0],
+                month__lte=all_months[-1],
+            ).values_list("month", "booked_days")
+        )
+        return Response(
+            {
+                "from": f"{first_month:%Y-%m}",
+                "months": [
+                    {
+                        "month": f"{month:%Y-%m}",
+                        "booked": days_to_string(month, booked.get(month, 0)),
+                    }
+                    for month in all_months
+                ],
+            }
         )
-        serialzer = CreateRoomBookingSerializer(booking)
-        return Response(serialzer.data)
@@ -55,6 +55,11 @@ class User(AbstractUser):
         null=True,
     )
     is_host = models.BooleanField(default=False)
+    # bumped to revoke every JWT issued so far
+    token_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
 
     def __str__(self) -> str:
         return f"{self.name} - {self.username}"
@@ -25,6 +25,7 @@ class PrivateUserSerializer(ModelSerializer):
             "last_name",
             "groups",
             "user_permissions",
+            "token_version",
         )
 
 
@@ -44,4 +45,5 @@ class publicUserSerializer(ModelSerializer):
             "user_permissions",
             "last_login",
             "currency",
+            "token_version",
         )
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from config.authentication import jwt_user_cache, token_user_cache
+from .models import User
+
+
+# a save touching only other fields (last_login on every log in) keeps the
+# cached users
+AUTH_FIELDS = {
+    "password",
+    "username",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "is_host",
+    "token_version",
+}
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not AUTH_FIELDS & set(update_fields):
+        return
+    jwt_user_cache.delete(instance.pk)
+    for key in Token.objects.filter(user=instance).values_list("key", flat=True):
+        token_user_cache.delete(key)
+
+
+@receiver(post_delete, sender=Token)
+def forget_cached_token(sender, instance, **kwargs):
+    token_user_cache.delete(instance.key)
@@ -10,5 +10,7 @@ urlpatterns = [
     path("log-out", views.LogOut.as_view()),
     path("token-login", obtain_auth_token),
     path("jwt-login", views.JWTLogIn.as_view()),
+    path("jwt-refresh", views.JWTRefresh.as_view()),
+    path("auth-cache-stats", views.AuthCacheStats.as_view()),
     path("@<str:username>", views.PublicUser.as_view()),
 ]
@@ -1,12 +1,21 @@
-import jwt
-from django.conf import settings
 from django.contrib.auth import authenticate, login, logout
 from django.db import transaction
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from django.db.models import F
+from rest_framework.permissions import (
+    IsAdminUser,
+    IsAuthenticated,
+    IsAuthenticatedOrReadOnly,
+)
 from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework import exceptions
 from rest_framework.response import Response
+from config.authentication import (
+    decode_token,
+    issue_tokens,
+    jwt_user_cache,
+    token_user_cache,
+)
 from .models import User
 from .serializers import PrivateUserSerializer, publicUserSerializer
 
@@ -82,10 +91,16 @@ class ChangePassword(APIView):
             raise exceptions.ParseError
 
         if not user.check_password(old_password):
-            raise ParseError
+            raise exceptions.ParseError
 
         user.set_password(new_password)
-        user.save()
+        with transaction.atomic():
+            # bumped in SQL: a read-modify-write would lose concurrent bumps
+            User.objects.filter(pk=user.pk).update(token_version=F("token_version") + 1)
+            user.save(update_fields=["password"])
+            # users.signals already evicted it, but before commit: a request
+            # in between may have cached the old token_version again
+            transaction.on_commit(lambda: jwt_user_cache.delete(user.pk))
         return Response(status=status.HTTP_200_OK)
 
 
@@ -122,7 +137,7 @@ class JWTLogIn(APIView):
         username = request.data.get("username")
         password = request.data.get("password")
         if not username or not password:
-            raise ParseError
+            raise exceptions.ParseError
 
         user = authenticate(
             request,
@@ -132,9 +147,35 @@ class JWTLogIn(APIView):
         if not user:
             return Response({"error": "wrong password"})
 
-        token = jwt.encode(
-            {"pk": user.pk},
-            settings.SECRET_KEY,
-            algorithm="HS256",
+        return Response(issue_tokens(user))
+
+
+class JWTRefresh(APIView):
+    def post(self, request):
+        refresh = request.data.get("refresh")
+        if not refresh:
+            raise exceptions.ParseError
+
+        decoded = decode_token(refresh, "refresh")
+        try:
+            user = User.objects.get(pk=decoded["pk"])
+        except User.DoesNotExist:
+            raise exceptions.AuthenticationFailed("User Not Found")
+        if user.token_version != decoded["ver"] or not user.is_active:
+            raise exceptions.AuthenticationFailed("Token Revoked")
+
+        return Response(issue_tokens(user))
+
+
+class AuthCacheStats(APIView):
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        # counters belong to the process that served this request
+        return Response(
+            {
+                "jwt_users": jwt_user_cache.stats(),
+                "tokens": token_user_cache.stats(),
+            }
         )
-        return Response({"token": token})
@@ -1,14 +1,15 @@
-from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import ModelSerializer, SerializerMethodField
 from .models import Wishlist
+from common.paginations import CreatedAtCursorPagination
 from rooms.serializers import RoomListSerializer
 
 
 class WishlistSerializer(ModelSerializer):
 
-    rooms = RoomListSerializer(
-        read_only=True,
-        many=True,
-    )
+    # the first page of rooms, newest first; the rest are paginated at
+    # /wishlists/<pk>/rooms
+    rooms = SerializerMethodField()
+    room_count = SerializerMethodField()
 
     class Meta:
         model = Wishlist
@@ -16,4 +17,13 @@ class WishlistSerializer(ModelSerializer):
             "pk",
             "name",
             "rooms",
+            "room_count",
         )
+
+    def get_rooms(self, wishlist):
+        # sliced in Python: wishlists.views.prefetch_rooms already loaded them
+        rooms = wishlist.rooms.all()[: CreatedAtCursorPagination.page_size]
+        return RoomListSerializer(rooms, many=True, context=self.context).data
+
+    def get_room_count(self, wishlist):
+        return len(wishlist.rooms.all())
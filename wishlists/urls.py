@@ -1,8 +1,16 @@
 from django.urls import path
-from .views import Wishlists, WishlistDetail, WishlistToggle
+from .views import (
+    Wishlists,
+    WishlistDetail,
+    WishlistItems,
+    WishlistRooms,
+    WishlistToggle,
+)
 
 urlpatterns = [
     path("", Wishlists.as_view()),
     path("<int:pk>", WishlistDetail.as_view()),
+    path("<int:pk>/rooms", WishlistRooms.as_view()),
+    path("<int:pk>/items", WishlistItems.as_view()),
     path("<int:pk>/room/<int:room_pk>", WishlistToggle.as_view()),
 ]
@@ -1,3 +1,7 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Exists, Prefetch, prefetch_related_objects
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework import exceptions
@@ -5,15 +9,34 @@ from rest_framework import status
 from rest_framework.response import Response
 from .models import Wishlist
 from .serializers import WishlistSerializer
+from common.m2m import add_m2m, check_pks, remove_m2m
+from common.paginations import CreatedAtCursorPagination
+from common.views import AsyncAPIView
+from experiences.models import Experience
 from rooms.models import Room
+from rooms.serializers import RoomListSerializer
 
 
-class Wishlists(APIView):
+def prefetch_rooms():
+    # wishlists are only ever read by their owner; ordered like the first
+    # page of /wishlists/<pk>/rooms
+    return Prefetch(
+        "rooms",
+        queryset=Room.objects.for_wishlist().order_by("-created_at", "-pk"),
+    )
+
+
+class Wishlists(AsyncAPIView):
 
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        all_wishlists = Wishlist.objects.filter(user=request.user)
+    async def get(self, request):
+        all_wishlists = [
+            wishlist
+            async for wishlist in Wishlist.objects.filter(
+                user=request.user,
+            ).prefetch_related(prefetch_rooms())
+        ]
         serializer = WishlistSerializer(
             all_wishlists,
             many=True,
@@ -34,7 +57,7 @@ class Wishlists(APIView):
         return Response(serializer.data)
 
 
-class WishlistDetail(APIView):
+class WishlistDetail(AsyncAPIView):
 
     permission_classes = [IsAuthenticated]
 
@@ -44,8 +67,14 @@ class WishlistDetail(APIView):
         except Wishlist.DoesNotExist:
             raise exceptions.NotFound
 
-    def get(self, request, pk):
-        wishlist = self.get_object(pk, request.user)
+    async def get(self, request, pk):
+        try:
+            wishlist = await Wishlist.objects.prefetch_related(prefetch_rooms()).aget(
+                pk=pk,
+                user=request.user,
+            )
+        except Wishlist.DoesNotExist:
+            raise exceptions.NotFound
         serializer = WishlistSerializer(
             wishlist,
             context={"request": request},
@@ -63,6 +92,7 @@ class WishlistDetail(APIView):
             return Response(serializer.errors)
 
         wishlist = serializer.save()
+        prefetch_related_objects([wishlist], prefetch_rooms())
         serializer = WishlistSerializer(
             wishlist,
             context={"request": request},
@@ -75,24 +105,90 @@ class WishlistDetail(APIView):
         return Response(status=status.HTTP_200_OK)
 
 
-class WishlistToggle(APIView):
-    def get_list(self, pk, user):
-        try:
-            return Wishlist.objects.get(pk=pk, user=user)
-        except Wishlist.DoesNotExist:
+class WishlistRooms(AsyncAPIView):
+
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request, pk):
+        if not await Wishlist.objects.filter(pk=pk, user=request.user).aexists():
             raise exceptions.NotFound
+        paginator = CreatedAtCursorPagination()
+        page = await sync_to_async(paginator.paginate_queryset)(
+            Room.objects.filter(wishlists=pk).for_wishlist(),
+            request,
+            view=self,
+        )
+        serializer = RoomListSerializer(
+            page,
+            many=True,
+            context={"request": request},
+        )
+        return paginator.get_paginated_response(serializer.data)
 
-    def get_room(self, pk):
-        try:
-            return Room.objects.get(pk=pk)
-        except Room.DoesNotExist:
+
+class WishlistToggle(APIView):
+
+    permission_classes = [IsAuthenticated]
+
+    def check_targets(self, pk, user, room_pk):
+        room_found = (
+            Wishlist.objects.filter(pk=pk, user=user)
+            .annotate(room_found=Exists(Room.objects.filter(pk=room_pk)))
+            .values_list("room_found", flat=True)
+            .first()
+        )
+        if not room_found:
             raise exceptions.NotFound
 
     def put(self, request, pk, room_pk):
-        wishlist = self.get_list(pk, request.user)
-        room = self.get_room(room_pk)
-        if wishlist.rooms.filter(pk=room.pk).exists():
-            wishlist.rooms.remove(room)
-        else:
-            wishlist.rooms.add(room)
+        # delete the link if there is one, otherwise insert it; the unique
+        # (wishlist, room) constraint absorbs a concurrent double-tap
+        with transaction.atomic():
+            removed, _ = Wishlist.rooms.through.objects.filter(
+                wishlist_id=pk,
+                wishlist__user=request.user,
+                room_id=room_pk,
+            ).delete()
+            if not removed:
+                self.check_targets(pk, request.user, room_pk)
+                add_m2m(Wishlist, pk, "rooms", [room_pk])
+        return Response(status=status.HTTP_200_OK)
+
+
+class WishlistItems(APIView):
+
+    permission_classes = [IsAuthenticated]
+
+    def get_changes(self, data):
+        """{field_name: (added pks, removed pks)}, every pk checked"""
+        changes = {}
+        for field_name, model, error in (
+            ("rooms", Room, "Room not found."),
+            ("experiences", Experience, "Experience not found."),
+        ):
+            items = data.get(field_name) or {}
+            if not isinstance(items, dict):
+                raise exceptions.ParseError(f"'{field_name}' should be an object.")
+            added, removed = items.get("add") or [], items.get("remove") or []
+            if type(added) is not list or type(removed) is not list:
+                raise exceptions.ParseError("'add' and 'remove' should be lists.")
+            try:
+                changes[field_name] = (
+                    check_pks(model, added),
+                    {model._meta.pk.to_python(pk) for pk in removed},
+                )
+            except (model.DoesNotExist, ValidationError):
+                raise exceptions.ParseError(error)
+        return changes
+
+    def put(self, request, pk):
+        if not Wishlist.objects.filter(pk=pk, user=request.user).exists():
+            raise exceptions.NotFound
+        changes = self.get_changes(request.data)
+        with transaction.atomic():
+            for field_name, (added, removed) in changes.items():
+                if removed:
+                    remove_m2m(Wishlist, pk, field_name, removed)
+                if added:
+                    add_m2m(Wishlist, pk, field_name, added)
         return Response(status=status.HTTP_200_OK)